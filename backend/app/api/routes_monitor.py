@@ -1,10 +1,28 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from app.api.routes_stream import last_anomaly, policy
-from app.db.sqlite import AuditDB
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
+
+from app.api.routes_stream import admission, ingest_queue, last_anomaly, manager, policy, scorer
+from app.core.cache import ResponseCache, Version, etag_matches
+from app.core.config import settings
+from app.db.store import make_audit_store
+from app.engine.profiling import CaptureBusy, capture_allocations, capture_profile
 
 router = APIRouter(tags=["monitor"])
-db = AuditDB()
+db = make_audit_store()
+read_cache = ResponseCache()
+
+
+def _cached(request: Request, key: tuple, version: Version, build) -> Response:
+    """
+    Serve a read endpoint from read_cache; 304 if the client already has this version.
+    """
+    etag = read_cache.etag(key, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    body = read_cache.get(key, version, build)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @router.get("/state/breaker")
@@ -12,27 +30,116 @@ def get_breaker_state():
     return policy.get_state()
 
 
+@router.get("/state/pipeline")
+def get_pipeline_state():
+    return admission.get_state()
+
+
 @router.get("/debug/last_anomaly")
 def debug_last_anomaly():
     return last_anomaly
 
 
+def _require_debug() -> None:
+    if not settings.debug_endpoints:
+        raise HTTPException(status_code=404, detail="debug endpoints disabled")
+
+
+@router.get("/debug/profile", response_class=PlainTextResponse)
+async def debug_profile(
+    seconds: float = Query(5.0, gt=0, le=60),
+    format: str = Query("collapsed", pattern="^(collapsed|pstats)$"),
+    top: int = Query(50, ge=1, le=500),
+):
+    _require_debug()
+    try:
+        return await capture_profile(seconds, fmt=format, top=top)  # type: ignore[arg-type]
+    except CaptureBusy as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+
+
+@router.get("/debug/memory")
+async def debug_memory(
+    seconds: float = Query(1.0, ge=0, le=60),
+    top: int = Query(25, ge=1, le=500),
+):
+    _require_debug()
+    try:
+        allocations = await capture_allocations(seconds, top=top)
+    except CaptureBusy as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    return {
+        "allocations": allocations,
+        "structures": {
+            **scorer.memory_stats(),
+            "alerts": policy.memory_stats(),
+            "connections": manager.connection_count(),
+            "ingest_queue": ingest_queue.qsize(),
+            "read_cache": read_cache.stats(),
+        },
+    }
+
+
 @router.get("/alerts/recent")
-def get_recent_alerts(limit: int = 50):
-    return {"alerts": policy.recent_alerts(limit=limit)}
+def get_recent_alerts(request: Request, limit: int = 50):
+    return _cached(
+        request,
+        ("alerts", limit),
+        (policy.write_seq,),
+        lambda: {"alerts": policy.recent_alerts(limit=limit)},
+    )
 
 
 @router.get("/audit/trades")
-def audit_trades(limit: int = 50):
-    return {"trades": db.recent_trades(limit=limit)}
+def audit_trades(request: Request, limit: int = 50):
+    return _cached(
+        request,
+        ("trades", limit),
+        (db.trades_seq,),
+        lambda: {"trades": db.recent_trades(limit=limit)},
+    )
 
 
 @router.get("/audit/breaker_events")
-def audit_breaker_events(limit: int = 50):
-    return {"events": db.recent_breaker_events(limit=limit)}
+def audit_breaker_events(request: Request, limit: int = 50):
+    return _cached(
+        request,
+        ("breaker_events", limit),
+        (db.breaker_events_seq,),
+        lambda: {"events": db.recent_breaker_events(limit=limit)},
+    )
+
+
+@router.get("/audit/score_distribution")
+def audit_score_distribution(
+    request: Request,
+    since_ts: Optional[float] = None,
+    until_ts: Optional[float] = None,
+    bins: int = 10,
+):
+    return _cached(
+        request,
+        ("score_distribution", since_ts, until_ts, bins),
+        (db.trades_seq,),
+        lambda: db.score_distribution(since_ts=since_ts, until_ts=until_ts, bins=bins),
+    )
+
+
+@router.get("/audit/symbol_summary")
+def audit_symbol_summary(
+    request: Request, since_ts: Optional[float] = None, until_ts: Optional[float] = None
+):
+    return _cached(
+        request,
+        ("symbol_summary", since_ts, until_ts),
+        (db.trades_seq,),
+        lambda: {"symbols": db.symbol_summary(since_ts=since_ts, until_ts=until_ts)},
+    )
 
 
 @router.post("/control/reset")
 def reset_policy():
     policy.reset()
+    admission.reset()
+    manager.set_breaker_snapshot(policy.get_state())
     return {"ok": True}
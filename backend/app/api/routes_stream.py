@@ -1,6 +1,11 @@
+import asyncio
+from typing import Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
+from app.core.config import settings
+from app.engine.admission import AdmissionController
 from app.engine.policy import CircuitBreakerPolicy
 from app.engine.scorer import ScoringEngine
 from app.engine.simulator import TradeSimulator
@@ -9,10 +14,25 @@ from app.features.windows import WindowTrade
 
 router = APIRouter(tags=["stream"])
 
-manager = ConnectionManager()
+manager = ConnectionManager(replay_size=settings.ws_replay_frames)
 simulator = TradeSimulator()
 scorer = ScoringEngine()
 policy = CircuitBreakerPolicy()
+admission = AdmissionController(
+    coalesce_lag_s=settings.coalesce_lag_s,
+    shed_lag_s=settings.shed_lag_s,
+    coalesce_depth=settings.coalesce_depth,
+    shed_depth=settings.shed_depth,
+    recover_seconds=settings.recover_seconds,
+    coalesce_interval_s=settings.coalesce_interval_s,
+    sample_every=settings.shed_sample_every,
+    queue_max=settings.ingest_queue_max,
+)
+manager.set_breaker_snapshot(policy.get_state())
+
+# Trades wait here between the feed and the scoring/persist/broadcast pipeline.
+# Bounded: when it is full the feed waits on put() instead of growing memory.
+ingest_queue: asyncio.Queue = asyncio.Queue(maxsize=max(0, settings.ingest_queue_max))
 
 # Debug: stores last processed anomaly output (so we can verify scoring is happening)
 last_anomaly = {
@@ -30,9 +50,10 @@ class ScenarioRequest(BaseModel):
 
 
 @router.websocket("/ws/trades")
-async def ws_trades(ws: WebSocket):
-    await manager.connect(ws)
+async def ws_trades(ws: WebSocket, since: Optional[int] = None):
+    # `since`: last frame seq the client saw; only newer frames are replayed
     try:
+        await manager.connect(ws, since_seq=since)
         while True:
             await ws.receive_text()
     except WebSocketDisconnect:
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+Version = Tuple[int, ...]
+
+
+class ResponseCache:
+    """
+    Bounded LRU of encoded JSON bodies for read endpoints.
+
+    Entries are keyed on (endpoint, params) and tagged with the write-sequence
+    version of the data they were built from; a lookup with a newer version is a
+    miss and rebuilds. ETags are derived from key + version, so a matching
+    If-None-Match can be answered without touching the cache at all.
+
+    Cached routes are sync handlers run from FastAPI's threadpool, so every
+    access to the LRU goes through one lock; builds run outside it.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = int(max_entries)
+        self._entries: OrderedDict[Hashable, Tuple[Version, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        # sequence numbers restart with the process; keep ETags from colliding across restarts
+        self._boot = os.urandom(8).hex()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def etag(self, key: Hashable, version: Version) -> str:
+        h = hashlib.blake2b(repr((self._boot, key, version)).encode(), digest_size=12)
+        return f'"{h.hexdigest()}"'
+
+    def get(self, key: Hashable, version: Version, build: Callable[[], Any]) -> bytes:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # build outside the lock so a slow query doesn't serialize every other read
+        body = json.dumps(build()).encode("utf-8")
+
+        with self._lock:
+            current = self._entries.get(key)
+            # another thread may have stored a newer version meanwhile; keep that one
+            if current is None or current[0] <= version:
+                self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return body
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": sum(len(b) for _, b in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
@@ -1,3 +1,5 @@
+import os
+
 from pydantic import BaseModel
 
 
@@ -5,5 +7,33 @@ class Settings(BaseModel):
     app_name: str = "chainproof-ai-shield"
     cors_allow_origins: list[str] = ["*"]
 
+    # simulator feed rate (trades per second); overridable for load tests
+    simulator_tps: float = float(os.environ.get("CHAINPROOF_SIM_TPS", "10.0"))
+
+    # bound on trades waiting for the pipeline; when full the feed blocks (backpressure)
+    ingest_queue_max: int = int(os.environ.get("CHAINPROOF_INGEST_QUEUE_MAX", "2000"))
+
+    # admission control: lag (seconds) / queue depth (trades) at which the pipeline
+    # coalesces broadcasts or also sheds DB writes, and how it degrades/recovers
+    coalesce_lag_s: float = float(os.environ.get("CHAINPROOF_COALESCE_LAG_S", "0.25"))
+    shed_lag_s: float = float(os.environ.get("CHAINPROOF_SHED_LAG_S", "1.0"))
+    coalesce_depth: int = int(os.environ.get("CHAINPROOF_COALESCE_DEPTH", "50"))
+    shed_depth: int = int(os.environ.get("CHAINPROOF_SHED_DEPTH", "500"))
+    recover_seconds: float = float(os.environ.get("CHAINPROOF_RECOVER_SECONDS", "2.0"))
+    coalesce_interval_s: float = float(os.environ.get("CHAINPROOF_COALESCE_INTERVAL_S", "0.25"))
+    shed_sample_every: int = int(os.environ.get("CHAINPROOF_SHED_SAMPLE_EVERY", "10"))
+
+    # anomaly detector used by ScoringEngine: "baseline" (windowed median/MAD) or "ewma" (O(1))
+    detector: str = os.environ.get("CHAINPROOF_DETECTOR", "baseline")
+
+    # audit backend: "sqlite" (row store) or "columnar" (memory-mapped segment files)
+    audit_backend: str = os.environ.get("CHAINPROOF_AUDIT_BACKEND", "sqlite")
+
+    # encoded /ws/trades frames kept for replay to new/reconnecting clients
+    ws_replay_frames: int = int(os.environ.get("CHAINPROOF_WS_REPLAY_FRAMES", "256"))
+
+    # /debug/profile and /debug/memory are off unless explicitly enabled
+    debug_endpoints: bool = os.environ.get("CHAINPROOF_DEBUG_ENDPOINTS", "0") in ("1", "true")
+
 
 settings = Settings()
@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_COLUMNAR_DIR = os.environ.get("CHAINPROOF_COLUMNAR_DIR", "chainproof_columns")
+
+# rows per segment file; every column file is preallocated to this length
+SEGMENT_ROWS = 1 << 16
+
+TRADE_COLUMNS: Dict[str, Any] = {
+    "ts": np.float64,
+    "symbol_id": np.int32,
+    "price": np.float64,
+    "qty": np.int64,
+    "side": np.int8,
+    "score": np.float64,
+    "state": np.int8,
+    "reasons_id": np.int32,
+    "scenario_id": np.int32,
+}
+
+SIDES = ["BUY", "SELL"]
+STATES = ["NORMAL", "WATCH", "HALT"]
+
+
+class _Interner:
+    def __init__(self, values: Optional[List[str]] = None) -> None:
+        self.values: List[str] = list(values or [])
+        self._ids = {v: i for i, v in enumerate(self.values)}
+
+    def intern(self, value: str) -> Tuple[int, bool]:
+        i = self._ids.get(value)
+        if i is not None:
+            return i, False
+        i = len(self.values)
+        self.values.append(value)
+        self._ids[value] = i
+        return i, True
+
+
+class _Segment:
+    def __init__(self, path: Path, seg_id: int, rows: int, min_ts: float, max_ts: float) -> None:
+        self.path = path
+        self.seg_id = seg_id
+        self.rows = rows
+        self.min_ts = min_ts
+        self.max_ts = max_ts
+        self._cols: Optional[Dict[str, np.memmap]] = None
+
+    def columns(self, writable: bool = False) -> Dict[str, np.memmap]:
+        # sealed segments are mapped read-only; reopen r+ if a reopened tail gets appended to
+        if self._cols is not None and not (writable and self._cols["ts"].mode == "r"):
+            return self._cols
+        self.path.mkdir(parents=True, exist_ok=True)
+        cols: Dict[str, np.memmap] = {}
+        for name, dtype in TRADE_COLUMNS.items():
+            f = self.path / f"{name}.bin"
+            mode = ("r+" if writable else "r") if f.exists() else "w+"
+            cols[name] = np.memmap(f, dtype=dtype, mode=mode, shape=(SEGMENT_ROWS,))
+        self._cols = cols
+        return cols
+
+    def flush(self) -> None:
+        if self._cols is not None:
+            for m in self._cols.values():
+                if m.mode != "r":
+                    m.flush()
+
+    def meta(self) -> Dict[str, Any]:
+        return {"id": self.seg_id, "rows": self.rows, "min_ts": self.min_ts, "max_ts": self.max_ts}
+
+
+class ColumnarAuditStore:
+    """
+    Append-only columnar audit backend (drop-in for AuditDB):
+    - trades go into fixed-width NumPy segment files, opened with np.memmap
+    - index.json keeps per-segment row count + min/max ts for pruning
+    - strings (symbol, reasons, scenario) are interned to ids in dictionary.json
+    - breaker events are rare, so they're a plain JSON-lines file
+
+    Aggregates scan only the segments overlapping the requested ts range and run
+    vectorized over the mapped columns, so nothing is loaded wholesale into RAM.
+    The index is flushed every `flush_every` rows; a crash can lose at most that
+    many trailing rows.
+    """
+
+    def __init__(self, root: str = DEFAULT_COLUMNAR_DIR, flush_every: int = 256) -> None:
+        self.root = Path(root)
+        self.flush_every = int(flush_every)
+        self._segments: List[_Segment] = []
+        self._symbols = _Interner()
+        self._reasons = _Interner()
+        self._scenarios = _Interner()
+        self._pending = 0
+        self._opened = False
+
+        # monotonic write sequences, bumped per insert (read caches key on these)
+        self.trades_seq = 0
+        self.breaker_events_seq = 0
+
+    # ---- lifecycle -------------------------------------------------------
+
+    def connect(self) -> None:
+        if self._opened:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        dict_path = self.root / "dictionary.json"
+        if dict_path.exists():
+            d = json.loads(dict_path.read_text(encoding="utf-8"))
+            self._symbols = _Interner(d.get("symbols"))
+            self._reasons = _Interner(d.get("reasons"))
+            self._scenarios = _Interner(d.get("scenarios"))
+        index_path = self.root / "index.json"
+        if index_path.exists():
+            for m in json.loads(index_path.read_text(encoding="utf-8"))["segments"]:
+                self._segments.append(
+                    _Segment(self._seg_path(m["id"]), m["id"], m["rows"], m["min_ts"], m["max_ts"])
+                )
+        self._opened = True
+
+    def init_schema(self) -> None:
+        self.connect()
+
+    def flush(self) -> None:
+        if self._segments:
+            self._segments[-1].flush()
+        self._write_json(
+            "index.json",
+            {"segment_rows": SEGMENT_ROWS, "segments": [s.meta() for s in self._segments]},
+        )
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._opened:
+            self.flush()
+
+    def _seg_path(self, seg_id: int) -> Path:
+        return self.root / f"seg_{seg_id:06d}"
+
+    def _write_json(self, name: str, obj: Any) -> None:
+        # write-then-rename so readers never see a torn file
+        tmp = self.root / f"{name}.tmp"
+        tmp.write_text(json.dumps(obj), encoding="utf-8")
+        os.replace(tmp, self.root / name)
+
+    def _write_dictionary(self) -> None:
+        self._write_json(
+            "dictionary.json",
+            {
+                "symbols": self._symbols.values,
+                "reasons": self._reasons.values,
+                "scenarios": self._scenarios.values,
+            },
+        )
+
+    # ---- writes ----------------------------------------------------------
+
+    def _active_segment(self) -> _Segment:
+        if not self._segments or self._segments[-1].rows >= SEGMENT_ROWS:
+            if self._segments:
+                self._segments[-1].flush()
+            seg_id = len(self._segments)
+            self._segments.append(_Segment(self._seg_path(seg_id), seg_id, 0, np.inf, -np.inf))
+        return self._segments[-1]
+
+    def insert_trade(self, row: Dict[str, Any]) -> None:
+        self.connect()
+        sym_id, new_sym = self._symbols.intern(str(row["symbol"]))
+        reasons_id, new_reasons = self._reasons.intern(str(row["reasons"]))
+        scenario_id, new_scenario = self._scenarios.intern(str(row["scenario"]))
+        if new_sym or new_reasons or new_scenario:
+            self._write_dictionary()
+
+        ts = float(row["ts"])
+        seg = self._active_segment()
+        cols = seg.columns(writable=True)
+        i = seg.rows
+        cols["ts"][i] = ts
+        cols["symbol_id"][i] = sym_id
+        cols["price"][i] = float(row["price"])
+        cols["qty"][i] = int(row["qty"])
+        cols["side"][i] = SIDES.index(str(row["side"])) if row["side"] in SIDES else -1
+        cols["score"][i] = float(row["anomaly_score"])
+        cols["state"][i] = STATES.index(str(row["breaker_state"]))
+        cols["reasons_id"][i] = reasons_id
+        cols["scenario_id"][i] = scenario_id
+        # widen the ts index before publishing the row, so readers that snapshot
+        # `rows` first always see min/max covering every row they read
+        seg.min_ts = min(seg.min_ts, ts)
+        seg.max_ts = max(seg.max_ts, ts)
+        seg.rows = i + 1
+        self.trades_seq += 1
+
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def insert_breaker_event(self, action: str, from_state: str, to_state: str) -> None:
+        self.connect()
+        ev = {"ts": time.time(), "action": action, "from_state": from_state, "to_state": to_state}
+        with open(self.root / "breaker_events.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(ev) + "\n")
+        self.breaker_events_seq += 1
+
+    # ---- point reads -----------------------------------------------------
+
+    def recent_trades(self, limit: int = 50) -> List[Dict[str, Any]]:
+        self.connect()
+        limit = max(0, int(limit))
+        parts: List[Dict[str, np.ndarray]] = []
+        need = limit
+        for seg in reversed(list(self._segments)):
+            if need <= 0:
+                break
+            # the pipeline appends while threadpool reads run: one row count per
+            # segment so every column is sliced to the same length
+            n = seg.rows
+            if n == 0:
+                continue
+            cols = seg.columns()
+            lo = max(0, n - need)
+            parts.append({k: np.asarray(v[lo:n]) for k, v in cols.items()})
+            need -= n - lo
+        if not parts:
+            return []
+
+        merged = {k: np.concatenate([p[k] for p in parts]) for k in TRADE_COLUMNS}
+        order = np.argsort(-merged["ts"], kind="stable")[:limit]
+        return [
+            {
+                "ts": float(merged["ts"][j]),
+                "symbol": self._symbols.values[merged["symbol_id"][j]],
+                "price": float(merged["price"][j]),
+                "qty": int(merged["qty"][j]),
+                "side": SIDES[merged["side"][j]] if merged["side"][j] >= 0 else "",
+                "anomaly_score": float(merged["score"][j]),
+                "breaker_state": STATES[merged["state"][j]],
+                "reasons": self._reasons.values[merged["reasons_id"][j]],
+                "scenario": self._scenarios.values[merged["scenario_id"][j]],
+            }
+            for j in order
+        ]
+
+    def recent_breaker_events(self, limit: int = 50) -> List[Dict[str, Any]]:
+        self.connect()
+        path = self.root / "breaker_events.jsonl"
+        if not path.exists():
+            return []
+        lines = path.read_text(encoding="utf-8").splitlines()
+        events = [json.loads(x) for x in lines if x.strip()]
+        events.sort(key=lambda e: e["ts"], reverse=True)
+        return events[: max(0, int(limit))]
+
+    # ---- vectorized aggregates -------------------------------------------
+
+    def _scan(self, since_ts: Optional[float], until_ts: Optional[float]):
+        lo = -np.inf if since_ts is None else float(since_ts)
+        hi = np.inf if until_ts is None else float(until_ts)
+        for seg in list(self._segments):
+            # rows first: inserts widen min/max before bumping rows, so these bounds
+            # cover all n rows even while the pipeline appends
+            n = seg.rows
+            min_ts, max_ts = seg.min_ts, seg.max_ts
+            # per-segment min/max ts index: skip segments outside the range
+            if n == 0 or max_ts < lo or min_ts > hi:
+                continue
+            cols = seg.columns()
+            if min_ts >= lo and max_ts <= hi:
+                mask = None
+            else:
+                ts = cols["ts"][:n]
+                mask = (ts >= lo) & (ts <= hi)
+            yield cols, n, mask
+
+    def score_distribution(
+        self,
+        since_ts: Optional[float] = None,
+        until_ts: Optional[float] = None,
+        bins: int = 10,
+    ) -> Dict[str, Any]:
+        self.connect()
+        bins = max(1, int(bins))
+        width = 100.0 / bins
+        edges = np.linspace(0.0, 100.0, bins + 1)
+        counts = np.zeros(bins, dtype=np.int64)
+        by_state = np.zeros(len(STATES), dtype=np.int64)
+        for cols, n, mask in self._scan(since_ts, until_ts):
+            score = cols["score"][:n]
+            state = cols["state"][:n]
+            if mask is not None:
+                score = score[mask]
+                state = state[mask]
+            # same bin rule as AuditDB's CAST(score / width AS INTEGER), not np.histogram's
+            # edge comparisons, so scores right at a boundary land in the same bin
+            b = np.clip((score / width).astype(np.int64), 0, bins - 1)
+            counts += np.bincount(b, minlength=bins)
+            by_state += np.bincount(state, minlength=len(STATES))[: len(STATES)]
+        return {
+            "edges": edges.tolist(),
+            "counts": counts.tolist(),
+            "total": int(counts.sum()),
+            "by_state": {s: int(c) for s, c in zip(STATES, by_state, strict=True)},
+        }
+
+    def symbol_summary(
+        self,
+        since_ts: Optional[float] = None,
+        until_ts: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        self.connect()
+        # symbols interned after this point are left out; rows using them are masked below
+        symbols = list(self._symbols.values)
+        n_sym = len(symbols)
+        count = np.zeros(n_sym, dtype=np.int64)
+        score_sum = np.zeros(n_sym, dtype=np.float64)
+        score_max = np.full(n_sym, -np.inf)
+        for cols, n, mask in self._scan(since_ts, until_ts):
+            sym = cols["symbol_id"][:n]
+            score = cols["score"][:n]
+            known = sym < n_sym
+            if mask is not None:
+                known &= mask
+            sym = sym[known]
+            score = score[known]
+            count += np.bincount(sym, minlength=n_sym)
+            score_sum += np.bincount(sym, weights=score, minlength=n_sym)
+            np.maximum.at(score_max, sym, score)
+        return [
+            {
+                "symbol": symbols[i],
+                "trades": int(count[i]),
+                "mean_score": float(score_sum[i] / count[i]),
+                "max_score": float(score_max[i]),
+            }
+            for i in np.flatnonzero(count)
+        ]
@@ -14,6 +14,10 @@ class AuditDB:
         self.db_path = db_path
         self._conn: Optional[sqlite3.Connection] = None
 
+        # monotonic write sequences, bumped per insert (read caches key on these)
+        self.trades_seq = 0
+        self.breaker_events_seq = 0
+
     def connect(self) -> None:
         if self._conn is not None:
             return
@@ -21,6 +25,11 @@ class AuditDB:
         self._conn.execute("PRAGMA journal_mode=WAL;")
         self._conn.execute("PRAGMA synchronous=NORMAL;")
 
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
     def init_schema(self) -> None:
         self.connect()
         assert self._conn is not None
@@ -50,6 +59,7 @@ class AuditDB:
             ),
         )
         self._conn.commit()
+        self.trades_seq += 1
 
     def insert_breaker_event(self, action: str, from_state: str, to_state: str) -> None:
         self.connect()
@@ -63,6 +73,7 @@ class AuditDB:
             (float(now), str(action), str(from_state), str(to_state)),
         )
         self._conn.commit()
+        self.breaker_events_seq += 1
 
     def recent_trades(self, limit: int = 50) -> List[Dict[str, Any]]:
         self.connect()
@@ -102,3 +113,68 @@ class AuditDB:
         )
         rows = cur.fetchall()
         return [{"ts": r[0], "action": r[1], "from_state": r[2], "to_state": r[3]} for r in rows]
+
+    def score_distribution(
+        self,
+        since_ts: Optional[float] = None,
+        until_ts: Optional[float] = None,
+        bins: int = 10,
+    ) -> Dict[str, Any]:
+        self.connect()
+        assert self._conn is not None
+        bins = max(1, int(bins))
+        width = 100.0 / bins
+        lo = float("-inf") if since_ts is None else float(since_ts)
+        hi = float("inf") if until_ts is None else float(until_ts)
+
+        counts = [0] * bins
+        cur = self._conn.execute(
+            """
+            SELECT MIN(MAX(CAST(anomaly_score / ? AS INTEGER), 0), ?) AS b, COUNT(*)
+            FROM trades WHERE ts >= ? AND ts <= ? GROUP BY b
+            """,
+            (width, bins - 1, lo, hi),
+        )
+        for b, c in cur.fetchall():
+            counts[int(b)] = int(c)
+
+        by_state = {"NORMAL": 0, "WATCH": 0, "HALT": 0}
+        cur = self._conn.execute(
+            "SELECT breaker_state, COUNT(*) FROM trades WHERE ts >= ? AND ts <= ? GROUP BY breaker_state",
+            (lo, hi),
+        )
+        for state, c in cur.fetchall():
+            by_state[str(state)] = int(c)
+
+        return {
+            "edges": [i * width for i in range(bins + 1)],
+            "counts": counts,
+            "total": sum(counts),
+            "by_state": by_state,
+        }
+
+    def symbol_summary(
+        self,
+        since_ts: Optional[float] = None,
+        until_ts: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        self.connect()
+        assert self._conn is not None
+        lo = float("-inf") if since_ts is None else float(since_ts)
+        hi = float("inf") if until_ts is None else float(until_ts)
+        cur = self._conn.execute(
+            """
+            SELECT symbol, COUNT(*), AVG(anomaly_score), MAX(anomaly_score)
+            FROM trades WHERE ts >= ? AND ts <= ? GROUP BY symbol
+            """,
+            (lo, hi),
+        )
+        return [
+            {
+                "symbol": r[0],
+                "trades": int(r[1]),
+                "mean_score": float(r[2]),
+                "max_score": float(r[3]),
+            }
+            for r in cur.fetchall()
+        ]
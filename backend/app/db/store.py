@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Optional, Union
+
+from app.core.config import settings
+from app.db.columnar import ColumnarAuditStore
+from app.db.sqlite import AuditDB
+
+AuditStore = Union[AuditDB, ColumnarAuditStore]
+
+
+def make_audit_store(backend: Optional[str] = None) -> AuditStore:
+    key = (backend or settings.audit_backend).strip().lower()
+    if key == "sqlite":
+        return AuditDB()
+    if key == "columnar":
+        return ColumnarAuditStore()
+    raise ValueError(f"unknown audit backend {key!r}; expected 'sqlite' or 'columnar'")
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Literal, Optional
+
+PipelineMode = Literal["NORMAL", "COALESCE", "SHED"]
+
+_LEVEL: Dict[str, int] = {"NORMAL": 0, "COALESCE": 1, "SHED": 2}
+_MODES: tuple[PipelineMode, ...] = ("NORMAL", "COALESCE", "SHED")
+
+
+class AdmissionController:
+    """
+    Lag-aware admission control for the trade pipeline:
+    - NORMAL: every trade is persisted and broadcast
+    - COALESCE: trade broadcasts are rate-limited to one per `coalesce_interval_s`:
+      the first trade after an interval goes out at once, later ones are held and
+      the newest held trade goes out when the interval ends (trailing edge), so
+      clients end up on the latest trade when a burst stops or the feed pauses
+    - SHED: COALESCE + only anomalous trades are persisted in full, the rest sampled
+
+    Scoring and breaker updates are never skipped; breaker events are always
+    persisted and broadcast. Escalation is immediate, stepping down needs the
+    pipeline to stay below thresholds for `recover_seconds`.
+
+    The ingest queue itself is bounded at `queue_max`; a full queue blocks the
+    feed rather than dropping trades, and those stalls are counted here.
+    """
+
+    def __init__(
+        self,
+        coalesce_lag_s: float = 0.25,
+        shed_lag_s: float = 1.0,
+        coalesce_depth: int = 50,
+        shed_depth: int = 500,
+        recover_seconds: float = 2.0,
+        coalesce_interval_s: float = 0.25,
+        sample_every: int = 10,
+        queue_max: int = 0,
+    ) -> None:
+        self.mode: PipelineMode = "NORMAL"
+        self.mode_since_ts: float = time.time()
+
+        # thresholds: event-time lag (seconds) and ingest queue depth (trades)
+        self.coalesce_lag_s = float(coalesce_lag_s)
+        self.shed_lag_s = float(shed_lag_s)
+        self.coalesce_depth = int(coalesce_depth)
+        self.shed_depth = int(shed_depth)
+        self.queue_max = int(queue_max)  # 0 = unbounded
+
+        # degraded-mode behaviour
+        self.recover_seconds = float(recover_seconds)
+        self.coalesce_interval_s = float(coalesce_interval_s)
+        self.sample_every = max(1, int(sample_every))
+
+        # internal
+        self._calm_since: Optional[float] = None
+        self._last_broadcast_ts = 0.0
+        self._pending: Optional[Dict[str, Any]] = None
+        self._sample_counter = 0
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.lag_s = 0.0
+        self.max_lag_s = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.processed = 0
+        self.broadcasts_coalesced = 0
+        self.trailing_broadcasts = 0
+        self.db_writes_sampled_out = 0
+        self.mode_changes = 0
+        self.feed_blocked = 0
+        self.feed_blocked_s = 0.0
+
+    def reset(self) -> None:
+        self.mode = "NORMAL"
+        self.mode_since_ts = time.time()
+        self._calm_since = None
+        self._last_broadcast_ts = 0.0
+        self._pending = None
+        self._sample_counter = 0
+        self._reset_stats()
+
+    def _target(self, lag_s: float, queue_depth: int) -> PipelineMode:
+        if lag_s >= self.shed_lag_s or queue_depth >= self.shed_depth:
+            return "SHED"
+        if lag_s >= self.coalesce_lag_s or queue_depth >= self.coalesce_depth:
+            return "COALESCE"
+        return "NORMAL"
+
+    def _set_mode(self, mode: PipelineMode, now: float) -> None:
+        if mode != self.mode:
+            self.mode = mode
+            self.mode_since_ts = now
+            self.mode_changes += 1
+
+    def observe(self, lag_s: float, queue_depth: int, now: Optional[float] = None) -> PipelineMode:
+        """
+        Record one dequeued trade's lag (now - trade.ts) and the remaining queue depth.
+        """
+        now = time.time() if now is None else now
+        self.processed += 1
+        self.lag_s = max(0.0, float(lag_s))
+        self.max_lag_s = max(self.max_lag_s, self.lag_s)
+        self.queue_depth = int(queue_depth)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        target = self._target(self.lag_s, self.queue_depth)
+        if _LEVEL[target] >= _LEVEL[self.mode]:
+            self._calm_since = None
+            self._set_mode(target, now)
+        else:
+            # step down one level at a time after a calm period
+            if self._calm_since is None:
+                self._calm_since = now
+            elif now - self._calm_since >= self.recover_seconds:
+                self._set_mode(_MODES[_LEVEL[self.mode] - 1], now)
+                self._calm_since = now
+        return self.mode
+
+    def record_feed_blocked(self, waited_s: float) -> None:
+        """
+        The feed found the ingest queue full and waited `waited_s` for room.
+        """
+        self.feed_blocked += 1
+        self.feed_blocked_s += max(0.0, float(waited_s))
+
+    def should_broadcast(self, has_breaker_event: bool, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        if (
+            self.mode == "NORMAL"
+            or has_breaker_event
+            or now - self._last_broadcast_ts >= self.coalesce_interval_s
+        ):
+            # this trade is newer than anything held
+            self._last_broadcast_ts = now
+            self._pending = None
+            return True
+        self.broadcasts_coalesced += 1
+        return False
+
+    def hold(self, payload: Dict[str, Any]) -> None:
+        """
+        Keep a coalesced trade for the trailing edge; replaces any older one.
+        """
+        self._pending = payload
+
+    def pending_due_in(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds until the held trade may go out (0 if due), None if nothing is held.
+        """
+        if self._pending is None:
+            return None
+        now = time.time() if now is None else now
+        return max(0.0, self._last_broadcast_ts + self.coalesce_interval_s - now)
+
+    def take_pending(self, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        The held trade if its interval has ended (it then counts as this interval's
+        broadcast), else None.
+        """
+        now = time.time() if now is None else now
+        if self._pending is None or now - self._last_broadcast_ts < self.coalesce_interval_s:
+            return None
+        payload, self._pending = self._pending, None
+        self._last_broadcast_ts = now
+        self.trailing_broadcasts += 1
+        return payload
+
+    def should_persist(self, anomalous: bool, has_breaker_event: bool) -> bool:
+        if self.mode != "SHED" or anomalous or has_breaker_event:
+            return True
+        self._sample_counter += 1
+        if self._sample_counter >= self.sample_every:
+            self._sample_counter = 0
+            return True
+        self.db_writes_sampled_out += 1
+        return False
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "mode_since_ts": self.mode_since_ts,
+            "lag_s": self.lag_s,
+            "max_lag_s": self.max_lag_s,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "counters": {
+                "processed": self.processed,
+                "broadcasts_coalesced": self.broadcasts_coalesced,
+                "trailing_broadcasts": self.trailing_broadcasts,
+                "db_writes_sampled_out": self.db_writes_sampled_out,
+                "mode_changes": self.mode_changes,
+                "feed_blocked": self.feed_blocked,
+                "feed_blocked_s": self.feed_blocked_s,
+            },
+            "thresholds": {
+                "coalesce_lag_s": self.coalesce_lag_s,
+                "shed_lag_s": self.shed_lag_s,
+                "coalesce_depth": self.coalesce_depth,
+                "shed_depth": self.shed_depth,
+                "queue_max": self.queue_max,
+            },
+            "shedding": {
+                "recover_seconds": self.recover_seconds,
+                "coalesce_interval_s": self.coalesce_interval_s,
+                "sample_every": self.sample_every,
+            },
+        }
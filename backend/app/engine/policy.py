@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 import time
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Literal, Optional
@@ -41,16 +42,21 @@ class CircuitBreakerPolicy:
         # timing
         self.halt_seconds = 10.0
         self.watch_grace_seconds = 6.0
+        self.halt_extend_seconds = 3.0
 
         # internal
         self._watch_since: Optional[float] = None
 
+        # bumped on every transition, alert or reset (read caches key on it)
+        self.write_seq = 0
+
     def reset(self) -> None:
         self.state = "NORMAL"
         self.last_change_ts = time.time()
         self.cooldown_until_ts = 0.0
         self._alerts.clear()
         self._watch_since = None
+        self.write_seq += 1
 
     def get_state(self) -> Dict[str, Any]:
         return {
@@ -66,14 +72,30 @@ class CircuitBreakerPolicy:
             "timing": {
                 "halt_seconds": self.halt_seconds,
                 "watch_grace_seconds": self.watch_grace_seconds,
+                "halt_extend_seconds": self.halt_extend_seconds,
             },
         }
 
+    def memory_stats(self) -> Dict[str, Any]:
+        return {
+            "len": len(self._alerts),
+            "max": self._max_alerts,
+            "bytes": sys.getsizeof(self._alerts)
+            + sum(sys.getsizeof(a) + sys.getsizeof(a.reasons) for a in self._alerts),
+        }
+
     def recent_alerts(self, limit: int = 50) -> List[Dict[str, Any]]:
         return [asdict(a) for a in self._alerts[-max(1, min(limit, self._max_alerts)) :]]
 
-    def update(self, symbol: str, score: float, reasons: List[str]) -> Dict[str, Any]:
-        now = time.time()
+    def update(
+        self,
+        symbol: str,
+        score: float,
+        reasons: List[str],
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        # `now` lets offline replays drive the state machine on the recorded clock
+        now = time.time() if now is None else now
         prev_state = self.state
         event: Optional[Dict[str, Any]] = None
 
@@ -95,7 +117,7 @@ class CircuitBreakerPolicy:
                     }
                 else:
                     # extend a bit if still risky
-                    self.cooldown_until_ts = now + 3.0
+                    self.cooldown_until_ts = now + self.halt_extend_seconds
 
         # NORMAL/WATCH logic
         if self.state != "HALT":
@@ -147,6 +169,9 @@ class CircuitBreakerPolicy:
             )
             if len(self._alerts) > self._max_alerts:
                 self._alerts = self._alerts[-self._max_alerts :]
+            self.write_seq += 1
+        elif event is not None:
+            self.write_seq += 1
 
         return {
             "state": self.state,
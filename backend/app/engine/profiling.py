@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter, deque
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+
+ProfileFormat = Literal["collapsed", "pstats"]
+
+# one capture at a time; profilers and tracemalloc are process-global
+_capture_lock = asyncio.Lock()
+
+
+class CaptureBusy(RuntimeError):
+    pass
+
+
+def approx_sizeof(obj: Any) -> int:
+    """
+    Recursive getsizeof over containers, dataclass/__slots__ objects and NumPy arrays.
+    Shared objects are counted once.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)  # includes the data buffer for owning ndarrays
+        if isinstance(o, (str, bytes, int, float, bool, np.ndarray, np.generic)) or o is None:
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        if hasattr(o, "__dict__"):
+            stack.append(vars(o))
+        for slot in getattr(type(o), "__slots__", ()):
+            if hasattr(o, slot):
+                stack.append(getattr(o, slot))
+    return total
+
+
+class SamplingProfiler:
+    """
+    Samples every thread's Python stack (except its own) every `interval` seconds
+    from a helper thread and aggregates collapsed stacks ("a;b;c count",
+    flamegraph format). Each stack is rooted at its thread name, so the event loop
+    and the threadpool running sync routes show up as separate towers.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = float(interval)
+        self.samples = 0
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names_by_id = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                names: List[str] = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                if names:
+                    names.append(names_by_id.get(thread_id, f"thread-{thread_id}"))
+                    self._stacks[";".join(reversed(names))] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="chainproof-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {n}" for stack, n in self._stacks.most_common())
+
+
+async def capture_profile(seconds: float, fmt: ProfileFormat = "collapsed", top: int = 50) -> str:
+    """
+    Profile the process for `seconds`. `collapsed` samples every thread, so the
+    sync read routes FastAPI runs in its threadpool (SQLite, json encoding) are
+    included next to the event loop; `pstats` is cProfile on the event-loop
+    thread only (pipeline, websockets, async routes).
+    Nothing is installed outside the capture window.
+    """
+    if _capture_lock.locked():
+        raise CaptureBusy("a profile or memory capture is already running")
+    async with _capture_lock:
+        if fmt == "collapsed":
+            sampler = SamplingProfiler()
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                sampler.stop()
+            return sampler.collapsed()
+
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            prof.disable()
+        out = io.StringIO()
+        pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(top)
+        return out.getvalue()
+
+
+async def capture_allocations(seconds: float, top: int = 25) -> Dict[str, Any]:
+    """
+    Top allocators by line. tracemalloc is only switched on for the capture
+    window, unless it was already tracing (e.g. PYTHONTRACEMALLOC), so only
+    allocations made during that window are attributed.
+    """
+    if _capture_lock.locked():
+        raise CaptureBusy("a profile or memory capture is already running")
+    async with _capture_lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            await asyncio.sleep(seconds)
+            snap = tracemalloc.take_snapshot()
+            traced, peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    stats = snap.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).statistics(
+        "lineno"
+    )
+    return {
+        "window_seconds": seconds if started else None,
+        "traced_bytes": traced,
+        "peak_bytes": peak,
+        "top": [
+            {
+                "where": f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+                "size_bytes": s.size,
+                "count": s.count,
+            }
+            for s in stats[: max(1, top)]
+        ],
+    }
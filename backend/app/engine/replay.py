@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.engine.simulator import TradeSimulator
+from app.features.build_features import FeatureBuilder, FeatureVector
+from app.features.windows import WindowTrade
+
+
+@dataclass
+class LabeledTrade:
+    trade: WindowTrade
+    attack: bool
+
+
+def record_stream(
+    duration_s: float = 600.0,
+    tps: float = 10.0,
+    attack_periods: Sequence[Tuple[float, float]] = ((200.0, 230.0), (420.0, 450.0)),
+    seed: int = 7,
+    start_ts: float = 1_700_000_000.0,
+) -> List[LabeledTrade]:
+    """
+    Deterministic simulator stream on a synthetic clock, labeled with the attack
+    periods (seconds from start). Used for offline benchmarks and tuning so every
+    candidate sees exactly the same trades.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    sim = TradeSimulator()
+
+    out: List[LabeledTrade] = []
+    n = int(duration_s * tps)
+    for i in range(n):
+        t = i / tps
+        attack = any(a <= t < b for a, b in attack_periods)
+        sim.set_scenario("attack" if attack else "normal")
+        ev = sim.next_trade(ts=start_ts + t)
+        out.append(
+            LabeledTrade(
+                trade=WindowTrade(
+                    ts=ev.ts, symbol=ev.symbol, price=ev.price, qty=ev.qty, side=ev.side
+                ),
+                attack=attack,
+            )
+        )
+    return out
+
+
+def featurize(stream: Sequence[LabeledTrade]) -> List[FeatureVector]:
+    fb = FeatureBuilder()
+    return [fb.update(x.trade) for x in stream]
@@ -1,17 +1,33 @@
 from __future__ import annotations
 
 from dataclasses import asdict
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
+from app.core.config import settings
+from app.engine.profiling import approx_sizeof
 from app.features.build_features import FeatureBuilder
 from app.features.windows import WindowTrade
+from app.models.base import AnomalyDetector
 from app.models.baseline import BaselineAnomalyModel
+from app.models.ewma import EwmaAnomalyDetector
+
+DETECTORS: Dict[str, Callable[[], AnomalyDetector]] = {
+    "baseline": BaselineAnomalyModel,
+    "ewma": EwmaAnomalyDetector,
+}
+
+
+def make_detector(name: str) -> AnomalyDetector:
+    key = name.strip().lower()
+    if key not in DETECTORS:
+        raise ValueError(f"unknown detector {name!r}; expected one of {sorted(DETECTORS)}")
+    return DETECTORS[key]()
 
 
 class ScoringEngine:
-    def __init__(self) -> None:
+    def __init__(self, detector: Optional[AnomalyDetector] = None) -> None:
         self._fb = FeatureBuilder()
-        self._model = BaselineAnomalyModel()
+        self._model = detector if detector is not None else make_detector(settings.detector)
 
     def process_trade(self, trade: WindowTrade) -> Dict[str, Any]:
         fv = self._fb.update(trade)
@@ -20,3 +36,19 @@ class ScoringEngine:
             "features": asdict(fv),
             "anomaly": {"score": res.score, "reasons": res.reasons},
         }
+
+    def memory_stats(self) -> Dict[str, Any]:
+        model = self._model
+        hist = getattr(model, "_hist_tps", None)
+        return {
+            "rolling_window": {"len": len(self._fb.w3), "bytes": approx_sizeof(self._fb.w3)},
+            "market_state": {
+                "symbols": len(self._fb.market),
+                "bytes": approx_sizeof(self._fb.market),
+            },
+            "detector": {
+                "type": type(model).__name__,
+                "history_len": len(hist) if hist is not None else None,
+                "bytes": approx_sizeof(model),
+            },
+        }
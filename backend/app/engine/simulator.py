@@ -2,7 +2,7 @@ import asyncio
 import random
 import time
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Optional
 
 import numpy as np
 
@@ -31,7 +31,7 @@ class TradeSimulator:
     def set_paused(self, paused: bool) -> None:
         self.paused = paused
 
-    def next_trade(self) -> TradeEvent:
+    def next_trade(self, ts: Optional[float] = None) -> TradeEvent:
         symbol = random.choice(self._symbols)
 
         drift = np.random.normal(0, 0.6)
@@ -47,7 +47,7 @@ class TradeSimulator:
         self._base_prices[symbol] = max(1.0, self._base_prices[symbol] + drift)
 
         return TradeEvent(
-            ts=time.time(),
+            ts=time.time() if ts is None else ts,
             symbol=symbol,
             price=float(round(self._base_prices[symbol], 2)),
             qty=qty,
@@ -56,10 +56,14 @@ class TradeSimulator:
 
     async def run(self, emit_fn, tps: float = 8.0) -> None:
         interval = 1.0 / max(1.0, tps)
+        # pace against a wall-clock schedule so slow emits don't silently lower the rate
+        next_at = time.monotonic()
         while True:
             if self.paused:
                 await asyncio.sleep(0.25)
+                next_at = time.monotonic()
                 continue
             trade = self.next_trade()
             await emit_fn(trade)
-            await asyncio.sleep(interval)
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - time.monotonic()))
@@ -1,27 +1,95 @@
 import asyncio
 import json
-from typing import Any
+from collections import deque
+from typing import Any, Deque, Optional, Tuple
 
 from fastapi import WebSocket
 
 
 class ConnectionManager:
-    def __init__(self) -> None:
+    """
+    Fan-out of pipeline frames to /ws/trades clients.
+
+    Every broadcast frame gets a sequence number and is kept, already encoded, in
+    a ring of the last `replay_size` frames. A new connection is sent the ring (or
+    only frames after the client's `since` sequence) and then the latest breaker
+    snapshot right after accept, so late joiners and reconnects don't have to
+    poll the REST endpoints to catch up.
+    """
+
+    def __init__(self, replay_size: int = 256) -> None:
         self._connections: set[WebSocket] = set()
         self._lock = asyncio.Lock()
+        self._seq = 0
+        self._ring: Deque[Tuple[int, str]] = deque(maxlen=max(0, int(replay_size)))
+        self._breaker_frame: Optional[str] = None
 
-    async def connect(self, ws: WebSocket) -> None:
+    def set_breaker_snapshot(self, snapshot: dict[str, Any]) -> None:
+        self._breaker_frame = json.dumps({"type": "breaker_state", "data": snapshot})
+
+    async def connect(self, ws: WebSocket, since_seq: Optional[int] = None) -> None:
         await ws.accept()
-        async with self._lock:
-            self._connections.add(ws)
+
+        frames = list(self._ring)
+        last_seq = self._seq
+        first_seq = frames[0][0] if frames else last_seq + 1
+        start = since_seq if since_seq is not None and since_seq <= last_seq else None
+        gap = since_seq is not None and (start is None or start + 1 < first_seq)
+        header = {
+            "type": "replay",
+            "since": since_seq,
+            "first_seq": first_seq,
+            "last_seq": last_seq,
+            "gap": gap,
+        }
+        await ws.send_text(json.dumps(header))
+
+        # Catch up without holding the lock so a slow joiner can't stall broadcasts.
+        # If the ring wraps past what we've sent meanwhile, say so with another
+        # `replay` notice (gap: true) rather than silently skipping frames.
+        # The breaker snapshot goes after the frames it may supersede (e.g. a HALT
+        # frame still in the ring after /control/reset). Once nothing newer is left,
+        # the lock is taken only to re-check that without awaiting and go live.
+        sent = max(start if start is not None else 0, first_seq - 1)
+        snapshot_sent: Optional[str] = None
+        while True:
+            frames = list(self._ring)
+            oldest = frames[0][0] if frames else self._seq + 1
+            if oldest > sent + 1:
+                notice = {
+                    "type": "replay",
+                    "since": sent,
+                    "first_seq": oldest,
+                    "last_seq": self._seq,
+                    "gap": True,
+                }
+                await ws.send_text(json.dumps(notice))
+                sent = oldest - 1
+            for seq, frame in frames:
+                if seq > sent:
+                    await ws.send_text(frame)
+                    sent = seq
+            snapshot = self._breaker_frame
+            if snapshot is not None and snapshot is not snapshot_sent:
+                await ws.send_text(snapshot)
+                snapshot_sent = snapshot
+            async with self._lock:
+                if self._seq <= sent and self._breaker_frame is snapshot_sent:
+                    self._connections.add(ws)
+                    return
 
     async def disconnect(self, ws: WebSocket) -> None:
         async with self._lock:
             self._connections.discard(ws)
 
+    def connection_count(self) -> int:
+        return len(self._connections)
+
     async def broadcast(self, message: dict[str, Any]) -> None:
-        data = json.dumps(message)
         async with self._lock:
+            self._seq += 1
+            data = json.dumps({**message, "seq": self._seq})
+            self._ring.append((self._seq, data))
             conns = list(self._connections)
 
         dead: list[WebSocket] = []
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.engine.policy import CircuitBreakerPolicy
+from app.engine.scorer import make_detector
+from app.features.build_features import FeatureVector
+from app.models.base import (
+    DEFAULT_PARAMS,
+    ScoreParams,
+    is_concentrated,
+    is_large_order_burst,
+    signal_components,
+)
+
+NORMAL, WATCH, HALT = 0, 1, 2
+
+BREAKER_PARAMS = (
+    "watch_threshold",
+    "halt_threshold",
+    "resume_score_threshold",
+    "halt_seconds",
+    "watch_grace_seconds",
+    "halt_extend_seconds",
+)
+
+
+@dataclass
+class RecordedStream:
+    """
+    Everything the sweep needs from one pass over a stream: per-trade ts, attack
+    label, |z| of tps/vol/vel, the six score components and the two
+    feature-only reason flags. Nothing here depends on the swept parameters.
+    """
+
+    ts: np.ndarray  # (T,)
+    labels: np.ndarray  # (T,) bool
+    z: np.ndarray  # (T, 3)
+    components: np.ndarray  # (T, 6)
+    concentrated: np.ndarray  # (T,) bool
+    large_burst: np.ndarray  # (T,) bool
+
+
+@dataclass
+class SweepResult:
+    configs: Dict[str, np.ndarray]  # name -> (K,)
+    halts: np.ndarray  # (K,) HALT transitions
+    false_halts: np.ndarray  # (K,) HALT transitions outside attack periods
+    time_in_halt: np.ndarray  # (K,) seconds
+    detected: np.ndarray  # (K,) attack periods during which the breaker tripped to HALT
+    mean_detect_latency: np.ndarray  # (K,) seconds from period start to that trip, nan if none
+    n_periods: int
+
+    def rows(self) -> List[Dict[str, Any]]:
+        out = []
+        for k in range(len(self.halts)):
+            row: Dict[str, Any] = {name: float(v[k]) for name, v in self.configs.items()}
+            row.update(
+                halts=int(self.halts[k]),
+                false_halts=int(self.false_halts[k]),
+                time_in_halt_s=float(self.time_in_halt[k]),
+                detected=f"{int(self.detected[k])}/{self.n_periods}",
+                mean_detect_latency_s=float(self.mean_detect_latency[k]),
+            )
+            out.append(row)
+        return out
+
+
+def record(
+    fvs: Sequence[FeatureVector], labels: Sequence[bool], detector: str = "baseline"
+) -> RecordedStream:
+    det = make_detector(detector)
+    z = np.empty((len(fvs), 3))
+    comps = np.empty((len(fvs), 6))
+    for i, fv in enumerate(fvs):
+        z[i] = det.zscores(fv)
+        comps[i] = signal_components(fv, *z[i])
+    return RecordedStream(
+        ts=np.array([fv.ts for fv in fvs], dtype=float),
+        labels=np.asarray(labels, dtype=bool),
+        z=z,
+        components=comps,
+        concentrated=np.array([is_concentrated(fv) for fv in fvs], dtype=bool),
+        large_burst=np.array([is_large_order_burst(fv) for fv in fvs], dtype=bool),
+    )
+
+
+def score_matrix(
+    rec: RecordedStream,
+    weights: np.ndarray,
+    z_cutoff: np.ndarray,
+    floors: Dict[str, float] = DEFAULT_PARAMS.floors,
+) -> np.ndarray:
+    """
+    (K, T) scores for K (weights, z_cutoff) configs; same mapping as combine_signals.
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    cut = np.asarray(z_cutoff, dtype=float).reshape(-1, 1)
+    scores = 100.0 * (weights @ rec.components.T)
+
+    z_tps, z_vol, z_vel = (rec.z[:, j][None, :] for j in range(3))
+    scores = np.where(
+        rec.concentrated[None, :], np.maximum(scores, floors["high_symbol_concentration"]), scores
+    )
+    scores = np.where(
+        rec.large_burst[None, :], np.maximum(scores, floors["large_order_burst"]), scores
+    )
+    scores = np.where(z_vel >= cut, np.maximum(scores, floors["price_jump_velocity"]), scores)
+    spike = (z_tps >= cut) | (z_vol >= cut)
+    scores = np.where(spike, np.maximum(scores, floors["rate_or_volume_spike"]), scores)
+    return np.clip(scores, 0.0, 100.0)
+
+
+def simulate_breaker(
+    ts: np.ndarray,
+    scores: np.ndarray,
+    params: Dict[str, np.ndarray],
+    score_index: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run CircuitBreakerPolicy.update's state machine for K configs at once.
+
+    `scores` is (U, T); config k reads row `score_index[k]` (default: row k, or
+    row 0 for every config when U == 1). `params` maps each of BREAKER_PARAMS
+    to a (K,) array. Returns (states (K, T) int8 after each trade, halt_events
+    (K, T) bool marking HALT transitions).
+    """
+    k = len(params["watch_threshold"])
+    scores = np.atleast_2d(scores)
+    if score_index is None:
+        score_index = np.zeros(k, dtype=int) if scores.shape[0] == 1 else np.arange(k)
+    watch_thr = np.asarray(params["watch_threshold"], dtype=float)
+    halt_thr = np.asarray(params["halt_threshold"], dtype=float)
+    resume_thr = np.asarray(params["resume_score_threshold"], dtype=float)
+    halt_s = np.asarray(params["halt_seconds"], dtype=float)
+    grace_s = np.asarray(params["watch_grace_seconds"], dtype=float)
+    extend_s = np.asarray(params["halt_extend_seconds"], dtype=float)
+
+    state = np.full(k, NORMAL, dtype=np.int8)
+    cooldown = np.zeros(k)
+    watch_since = np.full(k, np.nan)
+    states = np.empty((k, len(ts)), dtype=np.int8)
+    halt_events = np.zeros((k, len(ts)), dtype=bool)
+
+    for t in range(len(ts)):
+        now = ts[t]
+        x = scores[score_index, t]
+
+        # HALT: after cooldown resume on a low score, otherwise extend
+        ready = (state == HALT) & (now >= cooldown)
+        resume = ready & (x <= resume_thr)
+        state[resume] = NORMAL
+        watch_since[resume] = np.nan
+        extend = ready & ~resume
+        cooldown[extend] = now + extend_s[extend]
+
+        # NORMAL / WATCH (also runs for configs that just resumed, like the policy)
+        live = state != HALT
+        to_halt = live & (x >= halt_thr)
+        watchy = live & ~to_halt & (x >= watch_thr)
+        to_watch = watchy & (state == NORMAL)
+        escalate = (
+            watchy
+            & (state == WATCH)
+            & ~np.isnan(watch_since)
+            & (watch_since != 0.0)
+            & (now - watch_since >= grace_s)
+        )
+        normalize = live & (x < watch_thr) & (state == WATCH)
+
+        halted = to_halt | escalate
+        state[halted] = HALT
+        cooldown[halted] = now + halt_s[halted]
+        state[to_watch] = WATCH
+        watch_since[to_watch] = now
+        state[normalize] = NORMAL
+        watch_since[normalize] = np.nan
+
+        states[:, t] = state
+        halt_events[:, t] = halted
+
+    return states, halt_events
+
+
+def _periods(labels: np.ndarray) -> List[Tuple[int, int]]:
+    # contiguous labeled runs as [start, end) trade indices
+    edges = np.diff(np.concatenate(([0], labels.astype(np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1), strict=True))
+
+
+def evaluate(
+    rec: RecordedStream,
+    scores: np.ndarray,
+    params: Dict[str, np.ndarray],
+    score_index: Optional[np.ndarray] = None,
+) -> SweepResult:
+    states, halt_events = simulate_breaker(rec.ts, scores, params, score_index)
+    k = states.shape[0]
+
+    dt = np.diff(rec.ts, append=rec.ts[-1])
+    time_in_halt = ((states == HALT) * dt[None, :]).sum(axis=1)
+
+    periods = _periods(rec.labels)
+    detected = np.zeros(k, dtype=np.int64)
+    latency_sum = np.zeros(k)
+    for a, b in periods:
+        # detected = the breaker tripped during the period; a HALT still running
+        # from an earlier false trip doesn't count
+        tripped = halt_events[:, a:b]
+        hit = tripped.any(axis=1)
+        first = np.argmax(tripped, axis=1)
+        detected += hit
+        latency_sum += np.where(hit, rec.ts[a + first] - rec.ts[a], 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_latency = np.where(detected > 0, latency_sum / detected, np.nan)
+
+    return SweepResult(
+        configs={name: np.asarray(v) for name, v in params.items()},
+        halts=halt_events.sum(axis=1),
+        false_halts=(halt_events & ~rec.labels[None, :]).sum(axis=1),
+        time_in_halt=time_in_halt,
+        detected=detected,
+        mean_detect_latency=mean_latency,
+        n_periods=len(periods),
+    )
+
+
+def grid(**values: Sequence[float]) -> Dict[str, np.ndarray]:
+    """
+    Cartesian product of parameter lists -> name -> (K,) arrays.
+    """
+    names = list(values)
+    combos = list(itertools.product(*(values[n] for n in names)))
+    return {n: np.array([c[i] for c in combos], dtype=float) for i, n in enumerate(names)}
+
+
+def sweep(
+    rec: RecordedStream,
+    breaker: Dict[str, Sequence[float]],
+    z_cutoffs: Optional[Sequence[float]] = None,
+    weight_sets: Optional[Sequence[Sequence[float]]] = None,
+    params: ScoreParams = DEFAULT_PARAMS,
+) -> SweepResult:
+    """
+    Evaluate every combination of breaker params x z cutoffs x weight sets in one
+    pass over `rec`. Missing breaker params fall back to CircuitBreakerPolicy's;
+    z cutoffs / weight sets default to `params`' own, and its floors always apply.
+    """
+    if z_cutoffs is None:
+        z_cutoffs = (params.z_cutoff,)
+    if weight_sets is None:
+        weight_sets = (params.weights,)
+    defaults = CircuitBreakerPolicy()
+    axes: Dict[str, Sequence[float]] = {
+        name: breaker.get(name, [getattr(defaults, name)]) for name in BREAKER_PARAMS
+    }
+    axes["z_cutoff"] = list(z_cutoffs)
+    axes["weight_set"] = list(range(len(weight_sets)))
+    cfg = grid(**axes)
+
+    # score once per distinct (weight set, z cutoff), not once per config
+    score_keys = np.stack([cfg["weight_set"], cfg["z_cutoff"]], axis=1)
+    uniq, score_index = np.unique(score_keys, axis=0, return_inverse=True)
+    weights = np.asarray(weight_sets, dtype=float)[uniq[:, 0].astype(int)]
+    scores = score_matrix(rec, weights, uniq[:, 1], floors=params.floors)
+    return evaluate(rec, scores, cfg, score_index.reshape(-1))
@@ -6,6 +6,7 @@ from typing import Dict, List
 
 import numpy as np
 
+from app.features.market import MarketState
 from app.features.windows import RollingWindow, WindowTrade
 
 
@@ -19,6 +20,12 @@ class FeatureVector:
     price_vel_3s: float
     top_symbol_share_3s: float
     large_order_ratio_3s: float
+    # market-wide cross-symbol features (see MarketState)
+    mkt_dispersion: float = 0.0
+    mkt_breadth: float = 0.0
+    sym_mkt_dev: float = 0.0
+    sym_vol_ratio: float = 0.0
+    mkt_corr: float = 0.0
 
 
 class FeatureBuilder:
@@ -29,6 +36,7 @@ class FeatureBuilder:
     def __init__(self) -> None:
         self.w3 = RollingWindow(3.0)
         self._last_price: Dict[str, float] = {}
+        self.market = MarketState()
 
     def update(self, trade: WindowTrade) -> FeatureVector:
         self.w3.push(trade)
@@ -61,6 +69,7 @@ class FeatureBuilder:
         large_ratio = float(sum(1 for q in qtys if q >= p90)) / max(1, len(qtys))
 
         self._last_price[trade.symbol] = trade.price
+        mkt = self.market.update(trade.symbol, trade.price, trade.qty)
 
         return FeatureVector(
             ts=trade.ts,
@@ -71,4 +80,9 @@ class FeatureBuilder:
             price_vel_3s=float(price_vel),
             top_symbol_share_3s=float(top_share),
             large_order_ratio_3s=float(large_ratio),
+            mkt_dispersion=mkt.mkt_dispersion,
+            mkt_breadth=mkt.mkt_breadth,
+            sym_mkt_dev=mkt.sym_mkt_dev,
+            sym_vol_ratio=mkt.sym_vol_ratio,
+            mkt_corr=mkt.mkt_corr,
         )
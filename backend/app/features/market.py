@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+
+@dataclass
+class MarketFeatures:
+    mkt_dispersion: float  # cross-sectional std of per-symbol rolling returns
+    mkt_breadth: float  # share of active symbols with a positive rolling return
+    sym_mkt_dev: float  # current symbol's rolling return vs the other symbols', in dispersion units
+    sym_vol_ratio: float  # current symbol's rolling volume / market mean
+    mkt_corr: float  # mean per-symbol correlation with the rest of the market's return
+
+
+class MarketState:
+    """
+    Incremental market-wide state over the whole symbol universe.
+
+    Per-symbol rolling returns/volumes/co-moments live in NumPy arrays indexed by
+    an interned symbol id. A trade only touches its own row and adjusts running
+    cross-sectional sums, so each update is O(1) regardless of universe size.
+    Sums are re-derived vectorized every `resync_every` updates to stop float drift.
+
+    Rolling stats are per-symbol EWMAs over that symbol's own trades; a symbol that
+    stops trading keeps its last values. "Market" for a symbol's correlation and
+    deviation is the mean over the *other* active symbols, so in a small universe
+    a symbol isn't mostly correlated with itself.
+    """
+
+    def __init__(self, alpha: float = 0.1, capacity: int = 64, resync_every: int = 4096) -> None:
+        self.alpha = float(alpha)
+        self.resync_every = int(resync_every)
+        self._ids: Dict[str, int] = {}
+        self._n = 0
+        self._updates = 0
+        self._alloc(max(1, int(capacity)))
+
+        # running cross-sectional aggregates over active symbols
+        self._n_active = 0
+        self._sum_ret = 0.0
+        self._sumsq_ret = 0.0
+        self._n_up = 0
+        self._sum_vol = 0.0
+        self._sum_corr = 0.0
+
+    def _alloc(self, cap: int) -> None:
+        self.last_price = np.zeros(cap)
+        self.ret = np.zeros(cap)
+        self.vol = np.zeros(cap)
+        self.cov_rm = np.zeros(cap)
+        self.var_r = np.zeros(cap)
+        self.var_m = np.zeros(cap)
+        self.corr = np.zeros(cap)
+        self.active = np.zeros(cap, dtype=bool)
+
+    def _grow(self) -> None:
+        old = {
+            k: getattr(self, k)
+            for k in ("last_price", "ret", "vol", "cov_rm", "var_r", "var_m", "corr", "active")
+        }
+        self._alloc(2 * len(self.ret))
+        for k, arr in old.items():
+            getattr(self, k)[: len(arr)] = arr
+
+    def symbol_id(self, symbol: str) -> int:
+        i = self._ids.get(symbol)
+        if i is None:
+            if self._n == len(self.ret):
+                self._grow()
+            i = self._n
+            self._ids[symbol] = i
+            self._n += 1
+        return i
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _resync(self) -> None:
+        act = self.active[: self._n]
+        r = self.ret[: self._n][act]
+        self._n_active = int(act.sum())
+        self._sum_ret = float(r.sum())
+        self._sumsq_ret = float(np.dot(r, r))
+        self._n_up = int((r > 0).sum())
+        self._sum_vol = float(self.vol[: self._n][act].sum())
+        self._sum_corr = float(self.corr[: self._n][act].sum())
+
+    def _others_mean(self, i: int) -> float:
+        # leave-one-out market return for symbol i
+        if self._n_active < 2:
+            return 0.0
+        return (self._sum_ret - self.ret[i]) / (self._n_active - 1)
+
+    def update(self, symbol: str, price: float, qty: float) -> MarketFeatures:
+        i = self.symbol_id(symbol)
+        a = self.alpha
+
+        if not self.active[i]:
+            # first sighting: no return yet, just seed price/volume
+            self.active[i] = True
+            self.last_price[i] = price
+            self.vol[i] = qty
+            self._n_active += 1
+            self._sum_vol += qty
+        else:
+            r = (
+                math.log(price / self.last_price[i])
+                if self.last_price[i] > 0 and price > 0
+                else 0.0
+            )
+            self.last_price[i] = price
+
+            old_ret = self.ret[i]
+            new_ret = old_ret + a * (r - old_ret)
+            self.ret[i] = new_ret
+            self._sum_ret += new_ret - old_ret
+            self._sumsq_ret += new_ret * new_ret - old_ret * old_ret
+            self._n_up += int(new_ret > 0) - int(old_ret > 0)
+
+            old_vol = self.vol[i]
+            self.vol[i] = old_vol + a * (qty - old_vol)
+            self._sum_vol += self.vol[i] - old_vol
+
+            # co-movement of this trade's return with the market's rolling return
+            m = self._others_mean(i)
+            self.cov_rm[i] += a * (r * m - self.cov_rm[i])
+            self.var_r[i] += a * (r * r - self.var_r[i])
+            self.var_m[i] += a * (m * m - self.var_m[i])
+            den = math.sqrt(self.var_r[i] * self.var_m[i])
+            old_corr = self.corr[i]
+            self.corr[i] = self.cov_rm[i] / den if den > 1e-18 else 0.0
+            self._sum_corr += self.corr[i] - old_corr
+
+        self._updates += 1
+        if self._updates % self.resync_every == 0:
+            self._resync()
+
+        n = max(1, self._n_active)
+        mean = self._sum_ret / n
+        disp = math.sqrt(max(0.0, self._sumsq_ret / n - mean * mean))
+        mean_vol = self._sum_vol / n
+        return MarketFeatures(
+            mkt_dispersion=float(disp),
+            mkt_breadth=float(self._n_up / n),
+            sym_mkt_dev=float((self.ret[i] - self._others_mean(i)) / disp) if disp > 1e-12 else 0.0,
+            sym_vol_ratio=float(self.vol[i] / mean_vol) if mean_vol > 0 else 0.0,
+            mkt_corr=float(self._sum_corr / n),
+        )
@@ -1,16 +1,23 @@
 import asyncio
+import time
+from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes_health import router as health_router
+from app.api.routes_monitor import db
 from app.api.routes_monitor import router as monitor_router
-from app.api.routes_stream import enrich_trade, manager, simulator
+from app.api.routes_stream import (
+    admission,
+    enrich_trade,
+    ingest_queue,
+    manager,
+    policy,
+    simulator,
+)
 from app.api.routes_stream import router as stream_router
 from app.core.config import settings
-from app.db.sqlite import AuditDB
-
-db = AuditDB()
 
 app = FastAPI(title="ChainProof AI Shield", version="0.6.0")
 
@@ -27,13 +34,16 @@ app.include_router(stream_router)
 app.include_router(monitor_router)
 
 
-@app.on_event("startup")
-async def startup():
-    db.init_schema()
+async def process_trade(trade) -> None:
+    now = time.time()
+    admission.observe(lag_s=now - trade.ts, queue_depth=ingest_queue.qsize(), now=now)
 
-    async def emit(trade):
-        payload = enrich_trade(trade)
+    # scoring + breaker update always run, whatever the pipeline mode
+    payload = enrich_trade(trade)
+    breaker_event = payload.get("breaker_event")
+    anomalous = payload["anomaly"]["score"] >= policy.watch_threshold
 
+    if admission.should_persist(anomalous=anomalous, has_breaker_event=bool(breaker_event)):
         reasons_str = ",".join(payload["anomaly"]["reasons"])
         db.insert_trade(
             {
@@ -51,13 +61,66 @@ async def startup():
             }
         )
 
-        if payload.get("breaker_event"):
-            ev = payload["breaker_event"]
-            db.insert_breaker_event(ev["action"], ev["from"], ev["to"])
+    if breaker_event:
+        db.insert_breaker_event(breaker_event["action"], breaker_event["from"], breaker_event["to"])
+        manager.set_breaker_snapshot(policy.get_state())
 
+    if admission.should_broadcast(has_breaker_event=bool(breaker_event), now=now):
         await manager.broadcast({"type": "trade", "data": payload})
+    else:
+        admission.hold(payload)
+        _schedule_trailing_flush()
+
+    if breaker_event:
+        await manager.broadcast({"type": "breaker", "data": breaker_event})
+
+
+_trailing_flush: Optional[asyncio.Task] = None
+
+
+async def flush_coalesced() -> None:
+    # trailing edge of COALESCE: the newest held trade goes out once its interval ends
+    while (wait := admission.pending_due_in()) is not None:
+        if wait > 0:
+            await asyncio.sleep(wait)
+            continue
+        payload = admission.take_pending()
+        if payload is not None:
+            await manager.broadcast({"type": "trade", "data": payload})
+
+
+def _schedule_trailing_flush() -> None:
+    global _trailing_flush
+    if _trailing_flush is None or _trailing_flush.done():
+        _trailing_flush = asyncio.create_task(flush_coalesced())
+
+
+async def feed_trade(trade) -> None:
+    if ingest_queue.full():
+        # backpressure: the simulator awaits this, so the feed stalls until there's room
+        t0 = time.monotonic()
+        await ingest_queue.put(trade)
+        admission.record_feed_blocked(time.monotonic() - t0)
+    else:
+        ingest_queue.put_nowait(trade)
+
+
+async def run_pipeline() -> None:
+    while True:
+        trade = await ingest_queue.get()
+        await process_trade(trade)
+        # get() doesn't yield while the queue is non-empty; let the feed and HTTP run
+        await asyncio.sleep(0)
+
+
+@app.on_event("startup")
+async def startup():
+    db.init_schema()
+
+    asyncio.create_task(run_pipeline())
+    asyncio.create_task(simulator.run(emit_fn=feed_trade, tps=settings.simulator_tps))
 
-        if payload.get("breaker_event"):
-            await manager.broadcast({"type": "breaker", "data": payload["breaker_event"]})
 
-    asyncio.create_task(simulator.run(emit_fn=emit, tps=10.0))
+@app.on_event("shutdown")
+async def shutdown():
+    db.close()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Protocol, Tuple
+
+from app.features.build_features import FeatureVector
+
+# order of the score components / weights
+COMPONENTS = ("tps", "vol", "vel", "conc", "large", "qty")
+
+
+@dataclass
+class AnomalyResult:
+    score: float  # 0..100
+    reasons: List[str]
+
+
+@dataclass
+class ScoreParams:
+    """
+    Tunable constants of the 0..100 mapping (see scripts/sweep_breaker.py).
+    """
+
+    weights: Tuple[float, ...] = (0.25, 0.25, 0.20, 0.15, 0.10, 0.05)
+    z_cutoff: float = 3.5
+    # score floors applied when a reason fires (demo: attack triggers breaker fast)
+    floors: Dict[str, float] = field(
+        default_factory=lambda: {
+            "high_symbol_concentration": 75.0,
+            "large_order_burst": 82.0,
+            "price_jump_velocity": 88.0,
+            "rate_or_volume_spike": 80.0,
+        }
+    )
+
+
+DEFAULT_PARAMS = ScoreParams()
+
+
+class AnomalyDetector(Protocol):
+    """
+    Anything ScoringEngine can plug in: one FeatureVector in, 0..100 score + reasons out.
+    `zscores` exposes the |z| of tps / volume / price velocity that `score` feeds
+    to combine_signals (the sweep records these and rescores offline).
+    """
+
+    def score(self, fv: FeatureVector) -> AnomalyResult: ...
+
+    def zscores(self, fv: FeatureVector) -> Tuple[float, float, float]: ...
+
+
+def _clip01(x: float) -> float:
+    return float(max(0.0, min(1.0, x)))
+
+
+def signal_components(
+    fv: FeatureVector, z_tps: float, z_vol: float, z_vel: float
+) -> Tuple[float, ...]:
+    """
+    The six 0..1 signals that the weights combine, in COMPONENTS order.
+    """
+    return (
+        _clip01(z_tps / 6.0),
+        _clip01(z_vol / 6.0),
+        _clip01(z_vel / 6.0),
+        _clip01((fv.top_symbol_share_3s - 0.30) / 0.70),
+        _clip01((fv.large_order_ratio_3s - 0.20) / 0.80),
+        _clip01((fv.avg_qty_3s - 30.0) / 200.0),
+    )
+
+
+def is_concentrated(fv: FeatureVector) -> bool:
+    return fv.top_symbol_share_3s >= 0.65
+
+
+def is_large_order_burst(fv: FeatureVector) -> bool:
+    return fv.large_order_ratio_3s >= 0.30 and fv.avg_qty_3s >= 60
+
+
+def combine_signals(
+    fv: FeatureVector,
+    z_tps: float,
+    z_vol: float,
+    z_vel: float,
+    params: ScoreParams = DEFAULT_PARAMS,
+) -> AnomalyResult:
+    """
+    Shared reason rules + 0..100 mapping, so every detector explains itself the same way.
+    z values are absolute z-scores of tps / volume / price velocity.
+    """
+    reasons: List[str] = []
+
+    # Explainability rules
+    if is_concentrated(fv):
+        reasons.append("high_symbol_concentration")
+    if is_large_order_burst(fv):
+        reasons.append("large_order_burst")
+    if z_tps >= params.z_cutoff:
+        reasons.append("trade_rate_spike")
+    if z_vol >= params.z_cutoff:
+        reasons.append("volume_spike")
+    if z_vel >= params.z_cutoff:
+        reasons.append("price_jump_velocity")
+
+    # Map to 0..100 using multiple signals
+    comps = signal_components(fv, z_tps, z_vol, z_vel)
+    score = 100.0 * sum(w * c for w, c in zip(params.weights, comps, strict=True))
+
+    # Deterministic demo boosts (so attack triggers breaker fast)
+    floors = params.floors
+    if "high_symbol_concentration" in reasons:
+        score = max(score, floors["high_symbol_concentration"])
+    if "large_order_burst" in reasons:
+        score = max(score, floors["large_order_burst"])
+    if "price_jump_velocity" in reasons:
+        score = max(score, floors["price_jump_velocity"])
+    if "trade_rate_spike" in reasons or "volume_spike" in reasons:
+        score = max(score, floors["rate_or_volume_spike"])
+
+    if not reasons and score < 20:
+        reasons = ["normal_behavior"]
+
+    return AnomalyResult(score=float(min(100.0, max(0.0, score))), reasons=reasons)
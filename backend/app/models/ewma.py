@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import math
+
+from app.features.build_features import FeatureVector
+from app.models.base import AnomalyResult, ScoreParams, combine_signals
+
+
+class EwmaStat:
+    """
+    Constant-memory running location/scale for one feature.
+
+    Exponentially weighted mean/variance (Welford-style update, with the weight
+    floored at 1/n so warm-up behaves like a plain running mean), plus an EWMA
+    of absolute deviation as the robust scale.
+    """
+
+    __slots__ = ("alpha", "n", "mean", "var", "absdev")
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = float(alpha)
+        self.n = 0
+        self.mean = 0.0
+        self.var = 0.0
+        self.absdev = 0.0
+
+    def z(self, x: float) -> float:
+        # same warm-up staging as BaselineAnomalyModel: nothing, then std, then robust scale
+        if self.n < 10:
+            return 0.0
+        if self.n < 30:
+            return (x - self.mean) / (math.sqrt(self.var) + 1e-9)
+        # mean absolute deviation * sqrt(pi/2) ~= sigma for normal data
+        return (x - self.mean) / (1.2533 * self.absdev + 1e-9)
+
+    def push(self, x: float) -> None:
+        self.n += 1
+        a = max(self.alpha, 1.0 / self.n)
+
+        # winsorize once warm so a single outlier can't blow up the scale
+        if self.n > 30:
+            lim = 6.0 * (1.2533 * self.absdev + 1e-9)
+            x = min(max(x, self.mean - lim), self.mean + lim)
+
+        d = x - self.mean
+        self.mean += a * d
+        self.var = (1.0 - a) * (self.var + a * d * d)
+        self.absdev += a * (abs(d) - self.absdev)
+
+
+class EwmaAnomalyDetector:
+    """
+    O(1) streaming alternative to BaselineAnomalyModel:
+    - Constant memory and time per update (no sample history)
+    - Same reason codes and 0..100 mapping
+    - Scores against state *before* the current trade, then folds it in
+    """
+
+    def __init__(self, span: float = 500.0) -> None:
+        alpha = 2.0 / (float(span) + 1.0)
+        self._tps = EwmaStat(alpha)
+        self._vol = EwmaStat(alpha)
+        self._vel = EwmaStat(alpha)
+        self.params = ScoreParams()
+
+    def zscores(self, fv: FeatureVector) -> tuple[float, float, float]:
+        """
+        |z| of tps / volume / price velocity against the prior state, then fold fv in.
+        """
+        z_tps = abs(self._tps.z(fv.tps_3s))
+        z_vol = abs(self._vol.z(fv.vol_3s))
+        z_vel = abs(self._vel.z(fv.price_vel_3s))
+
+        self._tps.push(fv.tps_3s)
+        self._vol.push(fv.vol_3s)
+        self._vel.push(fv.price_vel_3s)
+        return z_tps, z_vol, z_vel
+
+    def score(self, fv: FeatureVector) -> AnomalyResult:
+        return combine_signals(fv, *self.zscores(fv), params=self.params)
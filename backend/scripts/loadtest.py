@@ -0,0 +1,481 @@
+"""
+Local load generator for the whole service.
+
+Starts the app (as a uvicorn subprocess by default, or in-process, or targets an
+already running server), then:
+- opens many /ws/trades clients, a share of them deliberately slow readers
+- hammers the monitor/audit HTTP routes from concurrent workers
+- drives the simulator at the requested TPS
+
+and reports trade-to-client latency percentiles (from the trade `ts` embedded in
+each frame), dropped connections, HTTP latency per route and server CPU/memory.
+
+Examples:
+    python scripts/loadtest.py --clients 500 --slow-clients 50 --tps 200 --duration 30
+    python scripts/loadtest.py --url http://127.0.0.1:8000 --server-pid 12345
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+import websockets
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+HTTP_ROUTES = [
+    "/state/breaker",
+    "/state/pipeline",
+    "/alerts/recent",
+    "/audit/trades",
+    "/audit/breaker_events",
+    "/debug/last_anomaly",
+]
+
+
+@dataclass
+class ClientStats:
+    connected: int = 0
+    connect_failures: int = 0
+    dropped: int = 0
+    frames: int = 0
+    latencies: List[float] = field(default_factory=list)
+    slow_latencies: List[float] = field(default_factory=list)
+
+
+@dataclass
+class HttpStats:
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class ResourceStats:
+    cpu_percent: List[float] = field(default_factory=list)
+    rss_bytes: List[int] = field(default_factory=list)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    a = np.asarray(values, dtype=float) * 1000.0
+    p50, p90, p99, p999 = np.percentile(a, [50, 90, 99, 99.9])
+    return {
+        "count": int(a.size),
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "p999_ms": float(p999),
+        "max_ms": float(a.max()),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def _raise_nofile_limit() -> None:
+    # thousands of sockets need more than the usual 1024 descriptors
+    try:
+        import resource
+
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+class ProcessSampler:
+    """
+    Samples CPU% and RSS of one pid. Uses psutil when installed, /proc otherwise.
+    """
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self._proc: Any = None
+        self._last_cpu: Optional[float] = None
+        self._last_wall: Optional[float] = None
+        try:
+            import psutil
+
+            self._proc = psutil.Process(pid)
+            self._proc.cpu_percent(None)
+        except ImportError:
+            self._proc = None
+
+    def _proc_cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat", encoding="utf-8") as f:
+            parts = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        # utime, stime are fields 14 and 15 (1-based) of the full line
+        return (int(parts[11]) + int(parts[12])) / ticks
+
+    def _proc_rss(self) -> int:
+        with open(f"/proc/{self.pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+        return 0
+
+    def sample(self) -> Optional[tuple[float, int]]:
+        try:
+            if self._proc is not None:
+                return float(self._proc.cpu_percent(None)), int(self._proc.memory_info().rss)
+            now = time.monotonic()
+            cpu = self._proc_cpu_seconds()
+            rss = self._proc_rss()
+        except Exception:  # process gone (OSError / psutil.NoSuchProcess) or unparsable
+            return None
+
+        pct = 0.0
+        if self._last_cpu is not None and self._last_wall is not None and now > self._last_wall:
+            pct = 100.0 * (cpu - self._last_cpu) / (now - self._last_wall)
+        self._last_cpu, self._last_wall = cpu, now
+        return pct, rss
+
+
+class ServerHandle:
+    def __init__(self, base_url: str, pid: Optional[int], stop_fn=None) -> None:
+        self.base_url = base_url
+        self.pid = pid
+        self._stop_fn = stop_fn
+
+    def stop(self) -> None:
+        if self._stop_fn is not None:
+            self._stop_fn()
+
+
+def _server_env(tps: float, db_path: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["CHAINPROOF_SIM_TPS"] = str(tps)
+    env["CHAINPROOF_DB_PATH"] = db_path
+    return env
+
+
+def start_subprocess_server(tps: float, db_path: str) -> ServerHandle:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=str(BACKEND_DIR),
+        env=_server_env(tps, db_path),
+    )
+
+    def stop() -> None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    return ServerHandle(f"http://127.0.0.1:{port}", proc.pid, stop)
+
+
+def start_inprocess_server(tps: float, db_path: str) -> ServerHandle:
+    # settings are read at import time, so the env must be in place first
+    os.environ.update(_server_env(tps, db_path))
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+    import uvicorn
+
+    from app.main import app
+
+    port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on")
+    )
+    thread = threading.Thread(target=server.run, name="loadtest-server", daemon=True)
+    thread.start()
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    # in-process CPU/RSS includes the load generator itself
+    return ServerHandle(f"http://127.0.0.1:{port}", os.getpid(), stop)
+
+
+async def wait_healthy(base_url: str, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            try:
+                r = await client.get("/health")
+                if r.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not become healthy in {timeout}s")
+
+
+async def ws_client(
+    ws_url: str,
+    stats: ClientStats,
+    stop: asyncio.Event,
+    slow_delay: float,
+) -> None:
+    try:
+        conn = await websockets.connect(ws_url, max_size=None, open_timeout=20)
+    except Exception:
+        stats.connect_failures += 1
+        return
+
+    stats.connected += 1
+    sink = stats.slow_latencies if slow_delay > 0 else stats.latencies
+    # frames up to the replay header's last_seq are history, not live latency
+    live_after = 0
+    try:
+        while not stop.is_set():
+            try:
+                raw = await asyncio.wait_for(conn.recv(), timeout=0.5)
+            except asyncio.TimeoutError:
+                continue
+            now = time.time()
+            stats.frames += 1
+            msg = json.loads(raw)
+            if msg.get("type") == "replay":
+                live_after = int(msg["last_seq"])
+                continue
+            if int(msg.get("seq", 0)) <= live_after:
+                # replayed history / breaker snapshot: drain it at full speed
+                continue
+            if msg.get("type") == "trade":
+                sink.append(now - float(msg["data"]["ts"]))
+            if slow_delay > 0:
+                await asyncio.sleep(slow_delay)
+    except websockets.ConnectionClosed:
+        if not stop.is_set():
+            stats.dropped += 1
+    finally:
+        await conn.close()
+
+
+async def http_worker(
+    client: httpx.AsyncClient,
+    stats: HttpStats,
+    stop: asyncio.Event,
+    offset: int,
+) -> None:
+    i = offset
+    while not stop.is_set():
+        route = HTTP_ROUTES[i % len(HTTP_ROUTES)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            r = await client.get(route)
+            ok = r.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        dt = time.perf_counter() - t0
+        if ok:
+            stats.latencies.setdefault(route, []).append(dt)
+        else:
+            stats.errors[route] = stats.errors.get(route, 0) + 1
+
+
+async def resource_sampler(
+    sampler: ProcessSampler,
+    stats: ResourceStats,
+    stop: asyncio.Event,
+    interval: float = 0.5,
+) -> None:
+    while not stop.is_set():
+        s = sampler.sample()
+        if s is not None:
+            stats.cpu_percent.append(s[0])
+            stats.rss_bytes.append(s[1])
+        await asyncio.sleep(interval)
+
+
+async def run_load(args: argparse.Namespace, server: ServerHandle) -> Dict[str, Any]:
+    await wait_healthy(server.base_url)
+    ws_url = server.base_url.replace("http://", "ws://", 1) + "/ws/trades"
+
+    async with httpx.AsyncClient(base_url=server.base_url, timeout=10.0) as client:
+        await client.post("/control/reset")
+        await client.post("/control/scenario", json={"scenario": args.scenario})
+
+        stop = asyncio.Event()
+        cstats = ClientStats()
+        hstats = HttpStats()
+        rstats = ResourceStats()
+        tasks: List[asyncio.Task] = []
+
+        if server.pid is not None:
+            tasks.append(
+                asyncio.create_task(resource_sampler(ProcessSampler(server.pid), rstats, stop))
+            )
+
+        # ramp clients in batches so the accept backlog isn't flooded
+        n_slow = min(args.slow_clients, args.clients)
+        for i in range(args.clients):
+            delay = args.slow_delay if i < n_slow else 0.0
+            tasks.append(asyncio.create_task(ws_client(ws_url, cstats, stop, delay)))
+            if (i + 1) % args.ramp_batch == 0:
+                await asyncio.sleep(0.05)
+
+        for i in range(args.http_concurrency):
+            tasks.append(asyncio.create_task(http_worker(client, hstats, stop, i)))
+
+        t0 = time.monotonic()
+        await asyncio.sleep(args.duration)
+        elapsed = time.monotonic() - t0
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    http_report = {
+        route: {
+            **percentiles(hstats.latencies.get(route, [])),
+            "rps": len(hstats.latencies.get(route, [])) / max(elapsed, 1e-9),
+            "errors": hstats.errors.get(route, 0),
+        }
+        for route in HTTP_ROUTES
+    }
+    rss = rstats.rss_bytes
+    return {
+        "config": {
+            "clients": args.clients,
+            "slow_clients": n_slow,
+            "slow_delay_s": args.slow_delay,
+            "tps": args.tps,
+            "http_concurrency": args.http_concurrency,
+            "duration_s": round(elapsed, 2),
+            "scenario": args.scenario,
+        },
+        "websocket": {
+            "connected": cstats.connected,
+            "connect_failures": cstats.connect_failures,
+            "dropped": cstats.dropped,
+            "frames": cstats.frames,
+            "latency_fast": percentiles(cstats.latencies),
+            "latency_slow": percentiles(cstats.slow_latencies),
+        },
+        "http": http_report,
+        "server": {
+            "pid": server.pid,
+            "cpu_percent_mean": float(np.mean(rstats.cpu_percent)) if rstats.cpu_percent else None,
+            "cpu_percent_max": float(np.max(rstats.cpu_percent)) if rstats.cpu_percent else None,
+            "rss_mb_max": (max(rss) / 1e6) if rss else None,
+            "rss_mb_last": (rss[-1] / 1e6) if rss else None,
+        },
+    }
+
+
+def _fmt_pct(p: Dict[str, float]) -> str:
+    if not p.get("count"):
+        return "n=0"
+    return (
+        f"n={p['count']} p50={p['p50_ms']:.1f}ms p90={p['p90_ms']:.1f}ms "
+        f"p99={p['p99_ms']:.1f}ms max={p['max_ms']:.1f}ms"
+    )
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    cfg = report["config"]
+    ws = report["websocket"]
+    srv = report["server"]
+    tps = "server's own" if cfg["tps"] is None else cfg["tps"]
+    print(
+        f"== load: {cfg['clients']} ws clients ({cfg['slow_clients']} slow), "
+        f"{tps} tps, {cfg['http_concurrency']} http workers, {cfg['duration_s']}s"
+    )
+    print(
+        f"ws: connected={ws['connected']} failed={ws['connect_failures']} "
+        f"dropped={ws['dropped']} frames={ws['frames']}"
+    )
+    print(f"  trade->client (fast): {_fmt_pct(ws['latency_fast'])}")
+    print(f"  trade->client (slow): {_fmt_pct(ws['latency_slow'])}")
+    print("http:")
+    for route, p in report["http"].items():
+        print(f"  {route:<22} {p['rps']:8.1f} rps  errors={p['errors']:<4} {_fmt_pct(p)}")
+    if srv["cpu_percent_mean"] is not None:
+        print(
+            f"server pid={srv['pid']}: cpu mean={srv['cpu_percent_mean']:.0f}% "
+            f"max={srv['cpu_percent_max']:.0f}%  rss max={srv['rss_mb_max']:.1f}MB"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="ChainProof WebSocket/HTTP load test")
+    ap.add_argument("--mode", choices=["subprocess", "inprocess"], default="subprocess")
+    ap.add_argument("--url", help="target an already running server instead of starting one")
+    ap.add_argument("--server-pid", type=int, help="pid to sample when using --url")
+    ap.add_argument("--clients", type=int, default=200)
+    ap.add_argument("--slow-clients", type=int, default=20)
+    ap.add_argument("--slow-delay", type=float, default=0.5, help="seconds slept per frame")
+    ap.add_argument("--ramp-batch", type=int, default=50)
+    ap.add_argument("--http-concurrency", type=int, default=10)
+    ap.add_argument(
+        "--tps",
+        type=float,
+        help="simulator rate of the server this script starts (default 50); not with --url",
+    )
+    ap.add_argument("--duration", type=float, default=20.0)
+    ap.add_argument("--scenario", choices=["normal", "attack"], default="normal")
+    ap.add_argument("--json", dest="json_path", help="also write the report as JSON")
+    args = ap.parse_args(argv)
+    if args.url and args.tps is not None:
+        ap.error(
+            "--tps only applies to a server started by this script; "
+            "set CHAINPROOF_SIM_TPS on the server behind --url instead"
+        )
+    if not args.url and args.tps is None:
+        args.tps = 50.0
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    _raise_nofile_limit()
+
+    with tempfile.TemporaryDirectory(prefix="chainproof-load-") as tmp:
+        db_path = str(Path(tmp) / "audit.db")
+        if args.url:
+            server = ServerHandle(args.url.rstrip("/"), args.server_pid)
+        elif args.mode == "inprocess":
+            server = start_inprocess_server(args.tps, db_path)
+        else:
+            server = start_subprocess_server(args.tps, db_path)
+
+        try:
+            report = asyncio.run(run_load(args, server))
+        finally:
+            server.stop()
+
+    print_report(report)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
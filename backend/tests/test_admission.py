@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import app.main as main
+from app.engine.admission import AdmissionController
+from app.engine.stream import ConnectionManager
+
+
+def test_admission_escalates_and_recovers_with_hysteresis():
+    a = AdmissionController()
+    assert a.observe(lag_s=0.01, queue_depth=0, now=100.0) == "NORMAL"
+    assert a.observe(lag_s=0.3, queue_depth=0, now=100.1) == "COALESCE"
+    assert a.observe(lag_s=0.0, queue_depth=1000, now=100.2) == "SHED"
+
+    # calm again, but must stay calm for recover_seconds per step
+    assert a.observe(lag_s=0.0, queue_depth=0, now=100.3) == "SHED"
+    assert a.observe(lag_s=0.0, queue_depth=0, now=102.4) == "COALESCE"
+    assert a.observe(lag_s=0.0, queue_depth=0, now=104.5) == "NORMAL"
+    assert a.get_state()["counters"]["mode_changes"] == 4
+
+
+def test_shed_mode_keeps_anomalies_and_breaker_events():
+    a = AdmissionController()
+    a.observe(lag_s=5.0, queue_depth=0, now=1.0)
+    assert a.mode == "SHED"
+
+    assert a.should_persist(anomalous=True, has_breaker_event=False)
+    assert a.should_persist(anomalous=False, has_breaker_event=True)
+    kept = sum(a.should_persist(anomalous=False, has_breaker_event=False) for _ in range(100))
+    assert kept == 100 // a.sample_every
+    assert a.db_writes_sampled_out == 100 - kept
+
+    assert a.should_broadcast(has_breaker_event=False, now=1.0)
+    assert not a.should_broadcast(has_breaker_event=False, now=1.1)
+    assert a.should_broadcast(has_breaker_event=True, now=1.1)
+    assert a.broadcasts_coalesced == 1
+
+
+def test_full_ingest_queue_blocks_the_feed_and_is_counted(monkeypatch):
+    async def run():
+        a = AdmissionController(queue_max=2)
+        q: asyncio.Queue = asyncio.Queue(maxsize=2)
+        monkeypatch.setattr(main, "admission", a)
+        monkeypatch.setattr(main, "ingest_queue", q)
+
+        await main.feed_trade("t1")
+        await main.feed_trade("t2")
+        blocked = asyncio.create_task(main.feed_trade("t3"))
+        await asyncio.sleep(0.05)
+        assert not blocked.done() and q.qsize() == 2
+
+        assert await q.get() == "t1"
+        await blocked
+        assert [q.get_nowait() for _ in range(2)] == ["t2", "t3"]
+
+        state = a.get_state()
+        assert state["counters"]["feed_blocked"] == 1
+        assert state["counters"]["feed_blocked_s"] >= 0.04
+        assert state["thresholds"]["queue_max"] == 2
+
+    asyncio.run(run())
+
+
+def test_admission_thresholds_are_configurable():
+    a = AdmissionController(coalesce_lag_s=1.0, shed_lag_s=3.0, shed_depth=10, sample_every=2)
+    assert a.observe(lag_s=0.5, queue_depth=0, now=1.0) == "NORMAL"
+    assert a.observe(lag_s=1.5, queue_depth=0, now=1.1) == "COALESCE"
+    assert a.observe(lag_s=0.0, queue_depth=10, now=1.2) == "SHED"
+    assert [a.should_persist(False, False) for _ in range(4)] == [False, True, False, True]
+    assert a.get_state()["thresholds"]["shed_lag_s"] == 3.0
+
+
+def test_coalesce_sends_newest_held_trade_on_trailing_edge(monkeypatch):
+    async def run():
+        a = AdmissionController(coalesce_interval_s=0.05)
+        m = ConnectionManager()
+        monkeypatch.setattr(main, "admission", a)
+        monkeypatch.setattr(main, "manager", m)
+        a.observe(lag_s=0.5, queue_depth=0)
+        assert a.mode == "COALESCE"
+
+        assert a.should_broadcast(has_breaker_event=False)
+        for i in (2, 3):
+            assert not a.should_broadcast(has_breaker_event=False)
+            a.hold({"i": i})
+        assert a.take_pending() is None  # interval not over yet
+
+        await main.flush_coalesced()
+        assert [json.loads(f)["data"] for _, f in m._ring] == [{"i": 3}]
+        assert a.pending_due_in() is None
+        assert a.get_state()["counters"]["trailing_broadcasts"] == 1
+
+        # a newer trade going out on the leading edge supersedes anything held
+        a.hold({"i": 4})
+        assert a.should_broadcast(has_breaker_event=True)
+        assert a.take_pending() is None
+
+    asyncio.run(run())
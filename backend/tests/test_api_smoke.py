@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 
+from app.api.routes_stream import admission
 from app.main import app
 
 
@@ -14,3 +15,19 @@ def test_breaker_state_endpoint():
     r = client.get("/state/breaker")
     assert r.status_code == 200
     assert "state" in r.json()
+
+
+def test_pipeline_state_endpoint():
+    client = TestClient(app)
+    r = client.get("/state/pipeline")
+    assert r.status_code == 200
+    assert r.json()["mode"] == "NORMAL"
+
+
+def test_control_reset_also_resets_pipeline_mode():
+    admission.observe(lag_s=5.0, queue_depth=0)
+    client = TestClient(app)
+    assert client.get("/state/pipeline").json()["mode"] == "SHED"
+    assert client.post("/control/reset").json()["ok"]
+    state = client.get("/state/pipeline").json()
+    assert state["mode"] == "NORMAL" and state["counters"]["processed"] == 0
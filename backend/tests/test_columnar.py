@@ -0,0 +1,91 @@
+import numpy as np
+
+from app.db.columnar import ColumnarAuditStore
+from app.db.sqlite import AuditDB
+
+
+def _row(ts: float, symbol: str, score: float, state: str = "NORMAL") -> dict:
+    return {
+        "ts": ts,
+        "symbol": symbol,
+        "price": 100.0 + ts,
+        "qty": 10,
+        "side": "BUY",
+        "anomaly_score": score,
+        "breaker_state": state,
+        "reasons": "normal_behavior" if score < 65 else "volume_spike",
+        "scenario": "normal",
+    }
+
+
+def _fill(store) -> None:
+    store.init_schema()
+    for i in range(100):
+        sym = "TCS" if i % 2 else "INFY"
+        store.insert_trade(_row(float(i), sym, float(i), "HALT" if i >= 85 else "NORMAL"))
+    store.insert_breaker_event("HALT", "NORMAL", "HALT")
+
+
+def test_columnar_matches_sqlite_reads_and_aggregates(tmp_path):
+    col = ColumnarAuditStore(str(tmp_path / "cols"), flush_every=16)
+    sql = AuditDB(str(tmp_path / "audit.db"))
+    _fill(col)
+    _fill(sql)
+
+    assert col.recent_trades(limit=5) == sql.recent_trades(limit=5)
+    assert col.recent_breaker_events(limit=5)[0]["action"] == "HALT"
+
+    for since, until in [(None, None), (10.0, 49.5)]:
+        assert col.score_distribution(since, until, bins=10) == sql.score_distribution(
+            since, until, bins=10
+        )
+        by_sym = lambda xs: sorted(xs, key=lambda x: x["symbol"])  # noqa: E731
+        assert by_sym(col.symbol_summary(since, until)) == by_sym(sql.symbol_summary(since, until))
+
+
+def test_columnar_matches_sqlite_on_non_integer_scores(tmp_path):
+    col = ColumnarAuditStore(str(tmp_path / "cols"))
+    sql = AuditDB(str(tmp_path / "audit.db"))
+    # scores at / just off 20-bin edges, plus ones float32 can't hold exactly
+    scores = [64.99999999, 65.0, 92.37, 14.999999999999998, 15.000000000000002, 56.666666666666664]
+    scores += [0.0, 100.0, 99.99999999, 4.99999999]
+    for store in (col, sql):
+        store.init_schema()
+        for i, score in enumerate(scores):
+            store.insert_trade(_row(float(i), "TCS" if i % 2 else "INFY", score))
+
+    assert col.recent_trades(limit=len(scores)) == sql.recent_trades(limit=len(scores))
+    for bins in (20, 30):
+        assert col.score_distribution(bins=bins) == sql.score_distribution(bins=bins)
+    assert sorted(t["anomaly_score"] for t in col.recent_trades(limit=len(scores))) == sorted(
+        scores
+    )
+
+
+def test_columnar_reopens_from_disk(tmp_path):
+    col = ColumnarAuditStore(str(tmp_path / "cols"))
+    _fill(col)
+    col.close()
+
+    again = ColumnarAuditStore(str(tmp_path / "cols"))
+    assert again.recent_trades(limit=1)[0]["ts"] == 99.0
+    again.insert_trade(_row(100.0, "RELIANCE", 90.0, "HALT"))
+    assert again.recent_trades(limit=1)[0]["symbol"] == "RELIANCE"
+    assert again.score_distribution()["total"] == 101
+
+
+def test_columnar_symbol_summary_tolerates_symbols_interned_mid_scan(tmp_path, monkeypatch):
+    col = ColumnarAuditStore(str(tmp_path / "cols"), flush_every=16)
+    _fill(col)
+    scan = col._scan
+
+    def scan_while_appending(since_ts, until_ts):
+        for part in scan(since_ts, until_ts):
+            # the pipeline interns a new symbol while a threadpool read is scanning
+            col.insert_trade(_row(1000.0, "NEWSYM", 50.0))
+            cols, n, mask = part
+            yield cols, n + 1, None if mask is None else np.append(mask, True)
+
+    monkeypatch.setattr(col, "_scan", scan_while_appending)
+    summary = {s["symbol"]: s["trades"] for s in col.symbol_summary()}
+    assert summary == {"INFY": 50, "TCS": 50}
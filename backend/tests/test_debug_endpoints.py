@@ -0,0 +1,53 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+
+def test_debug_endpoints_are_guarded(monkeypatch):
+    monkeypatch.setattr(settings, "debug_endpoints", False)
+    client = TestClient(app)
+    assert client.get("/debug/profile?seconds=0.1").status_code == 404
+    assert client.get("/debug/memory?seconds=0").status_code == 404
+
+
+def test_debug_profile_and_memory(monkeypatch):
+    monkeypatch.setattr(settings, "debug_endpoints", True)
+    client = TestClient(app)
+
+    r = client.get("/debug/profile?seconds=0.2&format=pstats")
+    assert r.status_code == 200
+    assert "function calls" in r.text
+
+    r = client.get("/debug/memory?seconds=0.1&top=5")
+    assert r.status_code == 200
+    body = r.json()
+    assert len(body["allocations"]["top"]) <= 5
+    assert {"rolling_window", "detector", "alerts", "connections", "ingest_queue"} <= set(
+        body["structures"]
+    )
+
+
+def _busy_sync_route(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_debug_profile_collapsed_samples_worker_threads(monkeypatch):
+    monkeypatch.setattr(settings, "debug_endpoints", True)
+    client = TestClient(app)
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_sync_route, args=(stop,), name="read-worker")
+    worker.start()
+    try:
+        r = client.get("/debug/profile?seconds=0.2&format=collapsed")
+    finally:
+        stop.set()
+        worker.join()
+    assert r.status_code == 200
+    assert any(
+        line.startswith("read-worker;") and "_busy_sync_route" in line
+        for line in r.text.splitlines()
+    )
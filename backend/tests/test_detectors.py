@@ -0,0 +1,40 @@
+import pytest
+
+from app.engine.scorer import ScoringEngine, make_detector
+from app.features.build_features import FeatureVector
+from app.models.baseline import BaselineAnomalyModel
+from app.models.ewma import EwmaAnomalyDetector
+
+
+def _fv(tps: float = 3.0, vol: float = 60.0, vel: float = 0.2) -> FeatureVector:
+    return FeatureVector(
+        ts=0.0,
+        symbol="TCS",
+        tps_3s=tps,
+        vol_3s=vol,
+        avg_qty_3s=20.0,
+        price_vel_3s=vel,
+        top_symbol_share_3s=0.3,
+        large_order_ratio_3s=0.1,
+    )
+
+
+def test_ewma_flags_spike_with_baseline_reason_codes():
+    det = EwmaAnomalyDetector()
+    for i in range(200):
+        res = det.score(_fv(vol=60.0 + (i % 7), vel=0.2 + 0.01 * (i % 5)))
+    assert res.reasons == ["normal_behavior"]
+
+    spike = det.score(_fv(vol=600.0, vel=5.0))
+    assert "volume_spike" in spike.reasons
+    assert "price_jump_velocity" in spike.reasons
+    assert 0.0 <= spike.score <= 100.0
+    assert spike.score >= 88.0
+
+
+def test_scoring_engine_selects_detector_by_name():
+    assert isinstance(make_detector("ewma"), EwmaAnomalyDetector)
+    assert isinstance(make_detector("baseline"), BaselineAnomalyModel)
+    assert isinstance(ScoringEngine(detector=EwmaAnomalyDetector())._model, EwmaAnomalyDetector)
+    with pytest.raises(ValueError):
+        make_detector("nope")
@@ -0,0 +1,41 @@
+import math
+
+import numpy as np
+
+from app.features.market import MarketState
+
+
+def test_market_state_incremental_sums_match_vectorized_recompute():
+    rng = np.random.default_rng(3)
+    m = MarketState(capacity=2, resync_every=10**9)
+    prices = {f"S{i}": 100.0 for i in range(50)}
+    for _ in range(3000):
+        s = f"S{rng.integers(0, 50)}"
+        prices[s] *= math.exp(rng.normal(0, 0.01))
+        out = m.update(s, prices[s], float(rng.integers(1, 100)))
+
+    r = m.ret[: len(m)][m.active[: len(m)]]
+    assert len(m) == 50
+    assert math.isclose(out.mkt_dispersion, float(np.std(r)), rel_tol=1e-6, abs_tol=1e-12)
+    assert math.isclose(out.mkt_breadth, float(np.mean(r > 0)))
+
+
+def test_coordinated_move_shows_in_breadth_and_correlation():
+    m = MarketState()
+    for k in range(200):
+        for i in range(20):
+            out = m.update(f"S{i}", 100.0 * (1.001**k), 10.0)
+    assert out.mkt_breadth == 1.0
+    assert out.mkt_corr > 0.9
+
+
+def test_independent_walks_are_uncorrelated_in_a_small_universe():
+    # the simulator trades 5 symbols; a self-inclusive market mean gave ~0.2 here
+    rng = np.random.default_rng(5)
+    m = MarketState()
+    prices = [100.0] * 5
+    for _ in range(20000):
+        i = int(rng.integers(0, 5))
+        prices[i] *= math.exp(rng.normal(0, 0.01))
+        out = m.update(f"S{i}", prices[i], 10.0)
+    assert abs(out.mkt_corr) < 0.05
@@ -0,0 +1,68 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.api.routes_stream import policy
+from app.core.cache import ResponseCache
+from app.main import app
+
+
+def test_cache_rebuilds_on_new_version_and_evicts_lru():
+    cache = ResponseCache(max_entries=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"n": len(builds)}
+
+    assert cache.get(("a",), (1,), build) == b'{"n": 1}'
+    assert cache.get(("a",), (1,), build) == b'{"n": 1}'
+    assert cache.get(("a",), (2,), build) == b'{"n": 2}'
+    cache.get(("b",), (1,), build)
+    cache.get(("c",), (1,), build)
+    assert cache.stats()["entries"] == 2
+    assert cache.evictions == 1
+    assert cache.etag(("a",), (1,)) != cache.etag(("a",), (2,))
+
+
+def test_cache_is_safe_under_concurrent_access():
+    cache = ResponseCache(max_entries=4)
+    errors = []
+
+    def worker(n: int) -> None:
+        try:
+            for i in range(2000):
+                key = ("k", (i + n) % 16)
+                body = cache.get(key, (i % 3,), lambda k=key: {"k": k[1]})
+                assert body == f'{{"k": {key[1]}}}'.encode()
+                cache.stats()
+        except Exception as e:  # surfaced below; threads swallow exceptions
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert cache.stats()["entries"] <= 4
+
+
+def test_alerts_endpoint_etag_roundtrip():
+    client = TestClient(app)
+    policy.reset()
+
+    r1 = client.get("/alerts/recent?limit=5")
+    assert r1.status_code == 200
+    etag = r1.headers["etag"]
+
+    r2 = client.get("/alerts/recent?limit=5", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+
+    policy.update(symbol="TCS", score=70.0, reasons=["volume_spike"])
+    r3 = client.get("/alerts/recent?limit=5", headers={"If-None-Match": etag})
+    assert r3.status_code == 200
+    assert r3.headers["etag"] != etag
+    assert r3.json()["alerts"][0]["symbol"] == "TCS"
+    policy.reset()
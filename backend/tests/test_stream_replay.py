@@ -0,0 +1,141 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.engine.stream import ConnectionManager
+from app.main import app
+
+
+class FakeWS:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+
+def test_new_connections_get_breaker_snapshot_and_ring_replay():
+    async def run():
+        m = ConnectionManager(replay_size=3)
+        m.set_breaker_snapshot({"state": "WATCH"})
+        for i in range(5):
+            await m.broadcast({"type": "trade", "data": {"i": i}})
+
+        late = FakeWS()
+        await m.connect(late)
+        assert late.sent[0]["type"] == "replay" and not late.sent[0]["gap"]
+        assert [f["seq"] for f in late.sent[1:-1]] == [3, 4, 5]
+        assert late.sent[-1] == {"type": "breaker_state", "data": {"state": "WATCH"}}
+
+        resumed = FakeWS()
+        await m.connect(resumed, since_seq=4)
+        assert [f["seq"] for f in resumed.sent[1:-1]] == [5]
+
+        too_old = FakeWS()
+        await m.connect(too_old, since_seq=1)
+        assert too_old.sent[0]["gap"]
+        assert [f["seq"] for f in too_old.sent[1:-1]] == [3, 4, 5]
+
+        await m.broadcast({"type": "trade", "data": {"i": 5}})
+        for ws in (late, resumed, too_old):
+            assert ws.sent[-1]["seq"] == 6
+
+    asyncio.run(run())
+
+
+def test_breaker_snapshot_follows_stale_breaker_frames_in_ring():
+    async def run():
+        m = ConnectionManager(replay_size=8)
+        m.set_breaker_snapshot({"state": "HALT"})
+        await m.broadcast({"type": "breaker", "data": {"state": "HALT"}})
+        # /control/reset only replaces the snapshot; the HALT frame stays in the ring
+        m.set_breaker_snapshot({"state": "NORMAL"})
+
+        late = FakeWS()
+        await m.connect(late)
+        breaker = [f for f in late.sent if f["type"] in ("breaker", "breaker_state")]
+        assert breaker[-1] == {"type": "breaker_state", "data": {"state": "NORMAL"}}
+
+    asyncio.run(run())
+
+
+class SlowWS(FakeWS):
+    async def send_text(self, data: str) -> None:
+        await asyncio.sleep(0.02)
+        await super().send_text(data)
+
+
+def test_slow_joiner_replay_does_not_stall_broadcast():
+    async def run():
+        m = ConnectionManager(replay_size=256)
+        for i in range(32):
+            await m.broadcast({"type": "trade", "data": {"i": i}})
+
+        slow = SlowWS()
+        joining = asyncio.create_task(m.connect(slow))
+
+        # keep the pipeline going (slower than the joiner drains) until it is live
+        loop = asyncio.get_running_loop()
+        worst = 0.0
+        n = 32
+        while not joining.done():
+            await asyncio.sleep(0.04)
+            t0 = loop.time()
+            await m.broadcast({"type": "trade", "data": {"i": n}})
+            worst = max(worst, loop.time() - t0)
+            n += 1
+        await joining
+        assert worst < 0.1
+
+        await m.broadcast({"type": "trade", "data": {"i": n}})
+        # every frame exactly once, in order, across the replay -> live handoff
+        seqs = [f["seq"] for f in slow.sent if f["type"] == "trade"]
+        assert seqs == list(range(1, n + 2))
+
+    asyncio.run(run())
+
+
+def test_ring_wrap_during_slow_join_is_reported_as_gap():
+    async def run():
+        m = ConnectionManager(replay_size=4)
+        for i in range(4):
+            await m.broadcast({"type": "trade", "data": {"i": i}})
+
+        slow = SlowWS()
+        joining = asyncio.create_task(m.connect(slow))
+        for i in range(20):
+            await asyncio.sleep(0.005)
+            await m.broadcast({"type": "trade", "data": {"i": 4 + i}})
+        await joining
+        await m.broadcast({"type": "trade", "data": {"i": 24}})
+
+        assert slow.sent[0]["type"] == "replay" and not slow.sent[0]["gap"]
+        notices = [f for f in slow.sent[1:] if f["type"] == "replay"]
+        assert notices and all(f["gap"] for f in notices)
+
+        # every jump in trade seqs is announced by a gap notice naming where it resumes
+        expected = 1
+        for f in slow.sent[1:]:
+            if f["type"] == "replay":
+                assert f["first_seq"] > expected
+                expected = f["first_seq"]
+            elif f["type"] == "trade":
+                assert f["seq"] == expected
+                expected += 1
+        assert expected == 26
+
+    asyncio.run(run())
+
+
+def test_ws_trades_sends_replay_header_and_breaker_state():
+    client = TestClient(app)
+    with client.websocket_connect("/ws/trades?since=0") as ws:
+        header = ws.receive_json()
+        assert header["type"] == "replay"
+        for _ in range(header["last_seq"] - header["first_seq"] + 1):
+            assert "seq" in ws.receive_json()
+        assert ws.receive_json()["type"] == "breaker_state"
@@ -0,0 +1,107 @@
+import numpy as np
+
+from app.engine.policy import CircuitBreakerPolicy
+from app.engine.replay import featurize, record_stream
+from app.engine.sweep import (
+    BREAKER_PARAMS,
+    HALT,
+    RecordedStream,
+    evaluate,
+    grid,
+    record,
+    score_matrix,
+    simulate_breaker,
+    sweep,
+)
+from app.models.base import DEFAULT_PARAMS, ScoreParams
+from app.models.baseline import BaselineAnomalyModel
+
+STATES = {"NORMAL": 0, "WATCH": 1, "HALT": 2}
+
+
+def test_vectorized_breaker_matches_policy_state_machine():
+    rng = np.random.default_rng(11)
+    n = 3000
+    ts = 1000.0 + np.cumsum(rng.uniform(0.05, 0.3, n))
+    # calm stretches with bursts, so every transition gets exercised
+    scores = np.where(rng.random(n) < 0.15, rng.uniform(60, 100, n), rng.uniform(0, 70, n))
+
+    cfg = grid(
+        watch_threshold=[55.0, 65.0],
+        halt_threshold=[85.0, 95.0],
+        resume_score_threshold=[35.0],
+        halt_seconds=[2.0, 10.0],
+        watch_grace_seconds=[1.0, 6.0],
+        halt_extend_seconds=[3.0],
+    )
+    states, halt_events = simulate_breaker(ts, scores, cfg)
+
+    for k in range(len(cfg["watch_threshold"])):
+        p = CircuitBreakerPolicy()
+        for name in BREAKER_PARAMS:
+            setattr(p, name, float(cfg[name][k]))
+        halts = 0
+        for t in range(n):
+            out = p.update("TCS", float(scores[t]), [], now=float(ts[t]))
+            assert STATES[out["state"]] == states[k, t]
+            halts += bool(out["event"] and out["event"]["action"] == "HALT")
+        assert halts == halt_events[k].sum()
+    assert (states == HALT).any()
+
+
+def test_score_matrix_matches_detector_scores():
+    stream = record_stream(duration_s=60.0, tps=10.0, attack_periods=((30.0, 40.0),))
+    fvs = featurize(stream)
+    rec = record(fvs, [x.attack for x in stream])
+
+    model = BaselineAnomalyModel()
+    expected = np.array([model.score(fv).score for fv in fvs])
+    got = score_matrix(rec, np.array([DEFAULT_PARAMS.weights]), np.array([DEFAULT_PARAMS.z_cutoff]))
+    np.testing.assert_allclose(got[0], expected, atol=1e-9)
+
+
+def _synthetic(n: int = 400, seed: int = 2) -> RecordedStream:
+    rng = np.random.default_rng(seed)
+    labels = np.zeros(n, dtype=bool)
+    labels[200:260] = True
+    return RecordedStream(
+        ts=np.arange(n) * 0.25,
+        labels=labels,
+        z=np.abs(rng.normal(0, 1.5, (n, 3))) + 4.0 * labels[:, None],
+        components=rng.uniform(0, 1, (n, 6)),
+        concentrated=np.zeros(n, dtype=bool),
+        large_burst=np.zeros(n, dtype=bool),
+    )
+
+
+def test_sweep_defaults_to_the_given_score_params():
+    rec = _synthetic()
+    params = ScoreParams(weights=(0.5, 0.5, 0.0, 0.0, 0.0, 0.0), z_cutoff=2.0)
+    res = sweep(rec, breaker={}, params=params)
+    assert res.configs["z_cutoff"].tolist() == [2.0]
+
+    explicit = sweep(rec, breaker={}, z_cutoffs=[2.0], weight_sets=[params.weights], params=params)
+    for field in ("halts", "false_halts", "time_in_halt", "detected", "mean_detect_latency"):
+        np.testing.assert_array_equal(getattr(res, field), getattr(explicit, field))
+
+
+def test_halt_carried_into_an_attack_period_is_not_a_detection():
+    rec = _synthetic()
+    scores = np.zeros((1, len(rec.ts)))
+    scores[0, [150, 220]] = 100.0  # false trip before the 200..260 attack, real one inside
+
+    cfg = grid(halt_seconds=[30.0, 2.0])
+    cfg.update(
+        {
+            name: np.full(2, getattr(CircuitBreakerPolicy(), name))
+            for name in BREAKER_PARAMS
+            if name != "halt_seconds"
+        }
+    )
+    res = evaluate(rec, scores, cfg)
+
+    # long HALT from the false trip spans the period start: no new trip, not detected
+    assert res.detected.tolist() == [0, 1]
+    assert res.false_halts.tolist() == [1, 1]
+    assert np.isnan(res.mean_detect_latency[0])
+    assert res.mean_detect_latency[1] == 20 * 0.25